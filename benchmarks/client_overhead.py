@@ -0,0 +1,325 @@
+"""
+Client-side overhead self-benchmark for the locustfiles
+
+Runs every task method of the REST, gRPC and unified (REST vs gRPC) user
+classes against an in-process, zero-latency fake transport and measures what the load
+generator itself costs per task:
+
+- client CPU time (µs per task and per request)
+- transient allocations (tracemalloc peak per task)
+- maximum achievable RPS per core (1e6 / CPU µs per request)
+
+The fake transports keep the real Locust request path intact: REST requests
+go through HttpSession with a mounted requests adapter, gRPC tasks call a
+stub that returns pre-built protobuf responses. The unified users get the
+same fakes through their GlossaryClient. `events.request` listeners
+(the stats aggregation) are attached exactly as in a real run.
+
+Usage:
+    python benchmarks/client_overhead.py
+    python benchmarks/client_overhead.py --save-baseline benchmarks/baseline.json
+    python benchmarks/client_overhead.py --baseline benchmarks/baseline.json --tolerance 0.25
+    python benchmarks/client_overhead.py --max-request-us 300
+
+Exit codes: 0 - ok, 1 - overhead regression / threshold exceeded
+"""
+
+import argparse
+import gc
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+from locust import events
+from locust.env import Environment
+import requests
+from requests.adapters import BaseAdapter
+
+
+FAKE_REST_HOST = "http://overhead.invalid"
+FAKE_GRPC_HOST = "overhead.invalid:50051"
+
+
+class FakeRESTAdapter(BaseAdapter):
+    """requests adapter answering glossary endpoints from memory"""
+
+    def __init__(self, term_count):
+        super().__init__()
+        terms = [{"id": f"term_{i}", "term": f"Term_{i}"} for i in range(term_count)]
+        graph = {
+            "nodes": [{"id": t["id"], "label": t["term"]} for t in terms],
+            "edges": [
+                {"source": terms[i]["id"], "target": terms[i - 1]["id"], "type": "related_to"}
+                for i in range(1, term_count)
+            ],
+        }
+        self.bodies = {
+            "/terms": json.dumps(terms).encode(),
+            "/graph": json.dumps(graph).encode(),
+        }
+        self.term_body = json.dumps(terms[0]).encode()
+
+    def send(self, request, **kwargs):
+        path = request.path_url.split("?", 1)[0]
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "application/json"
+        response._content = self.bodies.get(path, self.term_body)
+        response.url = request.url
+        response.request = request
+        response.reason = "OK"
+        return response
+
+    def close(self):
+        pass
+
+
+class FakeGlossaryStub:
+    """Stand-in for GlossaryServiceStub returning pre-built responses"""
+
+    def __init__(self, glossary_pb2, term_count):
+        terms = [
+            glossary_pb2.Term(term=f"Term_{i}", description=f"Description {i}")
+            for i in range(term_count)
+        ]
+        self._list = glossary_pb2.ListTermsResponse(terms=terms)
+        self._search = glossary_pb2.SearchTermsResponse(terms=terms[:10], total_count=len(terms))
+        self._term = terms[0]
+        self._relations = glossary_pb2.GetTermRelationsResponse(relations=[
+            glossary_pb2.Relation(source_term=terms[0].term, target_term=t.term, relation_type="related_to")
+            for t in terms[1:6]
+        ])
+
+    def ListTerms(self, request, timeout=None, **kwargs):
+        return self._list
+
+    def SearchTerms(self, request, timeout=None, **kwargs):
+        return self._search
+
+    def GetTerm(self, request, timeout=None, **kwargs):
+        return self._term
+
+    def GetTermRelations(self, request, timeout=None, **kwargs):
+        return self._relations
+
+    def AddTerm(self, request, timeout=None, **kwargs):
+        return self._term
+
+
+def load_user_classes():
+    """Collect the concrete user classes of the REST, gRPC and unified locustfiles"""
+    import locustfile_rest_simple as rest_module
+    import locustfile_unified as unified_module
+    user_classes = [
+        ("rest", rest_module.RESTUser),
+        ("rest", rest_module.LightUser),
+        ("rest", rest_module.HeavyUser),
+        ("rest", rest_module.StressUser),
+        ("rest", unified_module.RESTGlossaryUser),
+    ]
+
+    import locustfile_grpc_simple as grpc_module
+    if not grpc_module.glossary_pb2.available():
+        print("gRPC generated files not found - skipping gRPC user classes", file=sys.stderr)
+        return user_classes, None
+
+    user_classes += [
+        ("grpc", grpc_module.RESTLikeGrpcUser),
+        ("grpc", grpc_module.LightGrpcUser),
+        ("grpc", grpc_module.HeavyGrpcUser),
+        ("grpc", grpc_module.StressGrpcUser),
+        ("grpc", unified_module.GrpcGlossaryUser),
+    ]
+    return user_classes, grpc_module
+
+
+def create_user(environment, protocol, user_class, grpc_module, term_count):
+    """Instantiate a user wired to the fake transport"""
+    host = FAKE_REST_HOST if protocol == "rest" else FAKE_GRPC_HOST
+    attributes = {"host": host}
+    unified = hasattr(user_class, "create_client")
+    if unified:
+        # unified users build their GlossaryClient in on_start
+        def create_client(self):
+            glossary = user_class.create_client(self)
+            if protocol == "rest":
+                glossary.session.mount(glossary.base_url, FakeRESTAdapter(term_count))
+            else:
+                glossary.client.stub = FakeGlossaryStub(grpc_module.glossary_pb2, term_count)
+            return glossary
+        attributes["create_client"] = create_client
+    bench_class = type(user_class.__name__, (user_class,), attributes)
+    user = bench_class(environment)
+
+    if protocol == "rest" and not unified:
+        user.client.mount(FAKE_REST_HOST, FakeRESTAdapter(term_count))
+    elif not unified:
+        user.client.stub = FakeGlossaryStub(grpc_module.glossary_pb2, term_count)
+    user.on_start()
+    return user
+
+
+def unique_tasks(user):
+    """Task functions of a user class in declaration order, without weight duplicates"""
+    seen = []
+    for task_func in user.tasks:
+        if task_func not in seen:
+            seen.append(task_func)
+    return seen
+
+
+def measure_task(user, task_func, iterations, repeat, request_counter):
+    """Return CPU µs per task, requests per task and tracemalloc peak per task"""
+    for _ in range(min(iterations, 100)):
+        task_func(user)
+
+    samples = []
+    requests_per_task = 0.0
+    for _ in range(repeat):
+        gc.collect()
+        request_counter[0] = 0
+        start = time.process_time_ns()
+        for _ in range(iterations):
+            task_func(user)
+        elapsed = time.process_time_ns() - start
+        samples.append(elapsed / iterations / 1000)
+        requests_per_task = request_counter[0] / iterations
+
+    alloc_iterations = max(1, iterations // 10)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_iterations):
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            task_func(user)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+
+    return statistics.median(samples), requests_per_task, statistics.median(peaks)
+
+
+def run_benchmark(args):
+    random.seed(args.seed)
+    user_classes, grpc_module = load_user_classes()
+
+    environment = Environment(user_classes=[cls for _, cls in user_classes], events=events)
+    environment.create_local_runner()
+
+    request_counter = [0]
+
+    def count_request(**_kwargs):
+        request_counter[0] += 1
+
+    environment.events.request.add_listener(count_request)
+
+    results = []
+    for protocol, user_class in user_classes:
+        user = create_user(environment, protocol, user_class, grpc_module, args.terms)
+        for task_func in unique_tasks(user):
+            cpu_us, requests_per_task, alloc_peak = measure_task(
+                user, task_func, args.iterations, args.repeat, request_counter
+            )
+            us_per_request = cpu_us / requests_per_task if requests_per_task else cpu_us
+            results.append({
+                "key": f"{user_class.__name__}.{task_func.__name__}",
+                "protocol": protocol,
+                "cpu_us_per_task": round(cpu_us, 2),
+                "requests_per_task": round(requests_per_task, 2),
+                "cpu_us_per_request": round(us_per_request, 2),
+                "alloc_peak_bytes": int(alloc_peak),
+                "max_rps_per_core": int(1e6 / us_per_request) if us_per_request else 0,
+            })
+    return results
+
+
+def print_results(results):
+    print("=" * 100)
+    print("CLIENT-SIDE OVERHEAD (zero-latency fake transport)")
+    print("=" * 100)
+    print(f"{'Task':<50} {'µs/task':>9} {'req/task':>9} {'µs/req':>9} {'alloc KiB':>10} {'RPS/core':>10}")
+    print("-" * 100)
+    for r in results:
+        print(
+            f"{r['key']:<50} {r['cpu_us_per_task']:>9.1f} {r['requests_per_task']:>9.2f} "
+            f"{r['cpu_us_per_request']:>9.1f} {r['alloc_peak_bytes'] / 1024:>10.1f} {r['max_rps_per_core']:>10}"
+        )
+    print("=" * 100)
+
+
+def check_regressions(results, args):
+    """Return a list of human-readable threshold violations"""
+    violations = []
+
+    if args.max_request_us is not None:
+        for r in results:
+            if r["cpu_us_per_request"] > args.max_request_us:
+                violations.append(
+                    f"{r['key']}: {r['cpu_us_per_request']:.1f} µs/request > limit {args.max_request_us:.1f}"
+                )
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = {r["key"]: r for r in json.load(f)["results"]}
+        for r in results:
+            reference = baseline.get(r["key"])
+            if not reference:
+                continue
+            limit = reference["cpu_us_per_request"] * (1 + args.tolerance)
+            if r["cpu_us_per_request"] > limit:
+                violations.append(
+                    f"{r['key']}: {r['cpu_us_per_request']:.1f} µs/request > "
+                    f"baseline {reference['cpu_us_per_request']:.1f} (+{args.tolerance:.0%})"
+                )
+
+    return violations
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure Locust client-side overhead per task")
+    parser.add_argument("--iterations", type=int, default=2000, help="task calls per sample")
+    parser.add_argument("--repeat", type=int, default=5, help="samples per task (median is reported)")
+    parser.add_argument("--terms", type=int, default=50, help="terms returned by the fake transport")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--max-request-us", type=float, default=None,
+                        help="fail if any task exceeds this many CPU µs per request")
+    parser.add_argument("--baseline", help="baseline JSON produced by --save-baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25,
+                        help="allowed relative regression against the baseline")
+    parser.add_argument("--save-baseline", help="write results to this JSON file")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    results = run_benchmark(args)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print_results(results)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump({"terms": args.terms, "results": results}, f, indent=2)
+        # stderr keeps --json output parseable
+        print(f"Baseline saved to {args.save_baseline}", file=sys.stderr)
+
+    violations = check_regressions(results, args)
+    if violations:
+        print("OVERHEAD REGRESSION:", file=sys.stderr)
+        for violation in violations:
+            print(f"  - {violation}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""
+Achieved RPS per worker process across the gRPC execution backends
+
+Starts a generic gRPC server in a separate process (fixed
+service latency) and, for every backend and user count, a worker process
+that behaves like a Locust worker: gevent monkey-patched, one greenlet and
+one channel per simulated user, calls issued back to back through
+common.grpc_backends exactly as GrpcClient does.
+
+Usage:
+    python benchmarks/grpc_backends.py
+    python benchmarks/grpc_backends.py --users 50 200 500 --duration 10 --latency-ms 5
+    python benchmarks/grpc_backends.py --backends direct threadpool
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+SERVICE = "glossary.GlossaryService"
+METHOD = f"/{SERVICE}/GetTerm"
+RESPONSE = b"x" * 256
+
+
+def run_server(port, latency_ms, threads):
+    """Generic bytes-in/bytes-out server with a fixed service time"""
+    from concurrent import futures
+    import grpc
+
+    def get_term(request, context):
+        time.sleep(latency_ms / 1000)
+        return RESPONSE
+
+    server = grpc.server(futures.ThreadPoolExecutor(max_workers=threads))
+    server.add_generic_rpc_handlers([
+        grpc.method_handlers_generic_handler(SERVICE, {
+            "GetTerm": grpc.unary_unary_rpc_method_handler(get_term),
+        })
+    ])
+    server.add_insecure_port(f"127.0.0.1:{port}")
+    server.start()
+    print("ready", flush=True)
+    server.wait_for_termination()
+
+
+def run_worker(target, backend_name, users, duration, threadpool_size):
+    """Locust-like worker: monkey-patched gevent, one greenlet per user"""
+    from gevent import monkey
+    monkey.patch_all()
+
+    import gevent
+    from common.grpc_backends import get_backend
+
+    backend = get_backend(backend_name, threadpool_size)
+    completed = [0]
+    errors = [0]
+
+    def user():
+        channel = backend.create_channel(target)
+        get_term = channel.unary_unary(METHOD)
+        backend.invoke(get_term, b"warmup", 10)
+        while time.time() < stop_at:
+            try:
+                backend.invoke(get_term, b"term", 10)
+                completed[0] += 1
+            except Exception:
+                errors[0] += 1
+        backend.close_channel(channel)
+
+    stop_at = time.time() + duration
+    start = time.time()
+    gevent.joinall([gevent.spawn(user) for _ in range(users)])
+    elapsed = time.time() - start
+
+    print(json.dumps({
+        "backend": backend_name,
+        "users": users,
+        "requests": completed[0],
+        "errors": errors[0],
+        "rps": completed[0] / elapsed,
+    }), flush=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare gRPC execution backends per worker process")
+    parser.add_argument("--backends", nargs="+", default=["direct", "gevent", "threadpool"])
+    parser.add_argument("--users", nargs="+", type=int, default=[50, 200, 500])
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per measurement")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="server-side service time")
+    parser.add_argument("--threadpool-size", type=int, default=32)
+    parser.add_argument("--port", type=int, default=50551)
+    parser.add_argument("--server", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    target = f"127.0.0.1:{args.port}"
+
+    if args.server:
+        run_server(args.port, args.latency_ms, max(args.users) + 16)
+        return
+    if args.worker:
+        run_worker(target, args.backends[0], args.users[0], args.duration, args.threadpool_size)
+        return
+
+    script = os.path.abspath(__file__)
+    server = subprocess.Popen(
+        [sys.executable, script, "--server", "--port", str(args.port),
+         "--latency-ms", str(args.latency_ms), "--users", str(max(args.users))],
+        stdout=subprocess.PIPE, text=True,
+    )
+    try:
+        server.stdout.readline()
+        results = []
+        for backend in args.backends:
+            for users in args.users:
+                output = subprocess.run(
+                    [sys.executable, script, "--worker", "--port", str(args.port),
+                     "--backends", backend, "--users", str(users),
+                     "--duration", str(args.duration), "--threadpool-size", str(args.threadpool_size)],
+                    capture_output=True, text=True,
+                )
+                if output.returncode != 0:
+                    print(f"{backend} @ {users} users failed:\n{output.stderr}")
+                    continue
+                result = json.loads(output.stdout.strip().splitlines()[-1])
+                results.append(result)
+                print(f"  {backend:<11} {users:>4} users: {result['rps']:>9.1f} RPS ({result['errors']} errors)")
+    finally:
+        server.terminate()
+        server.wait()
+
+    print("=" * 60)
+    print(f"ACHIEVED RPS PER WORKER (service latency {args.latency_ms} ms)")
+    print("=" * 60)
+    print(f"{'Backend':<12}" + "".join(f"{f'{u} users':>14}" for u in args.users))
+    for backend in args.backends:
+        row = {r["users"]: r["rps"] for r in results if r["backend"] == backend}
+        print(f"{backend:<12}" + "".join(f"{row.get(u, 0):>14.1f}" for u in args.users))
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,12 @@
-"""Common utilities for Locust load testing"""
+"""
+Common utilities for Locust load testing
 
-from .config import Config
-from .data_generator import DataGenerator
+Protocol-specific modules (call_policy, glossary_client, grpc_backends,
+grpc_client, startup, ...) are not imported here, so importing the package
+never pulls in grpc.
+"""
 
-__all__ = ['Config', 'DataGenerator']
+from .config import Config, ConfigError, ConfigSnapshot
+from .data_generator import DataGenerator
 
+__all__ = ['Config', 'ConfigError', 'ConfigSnapshot', 'DataGenerator']
@@ -0,0 +1,369 @@
+"""Per-call deadline, retry and hedging policies for REST and gRPC calls"""
+import json
+import random
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Collection, Dict, FrozenSet, Optional
+from urllib.parse import urlsplit
+
+import gevent
+from locust.clients import HttpSession
+
+from .session_model import normalize_endpoint
+
+
+def parse_duration(value) -> Optional[float]:
+    """Parse a duration in seconds: 0.5, "0.5s" or "500ms" (service-config style)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    value = value.strip()
+    if value.endswith("ms"):
+        return float(value[:-2]) / 1000
+    if value.endswith("s"):
+        return float(value[:-1])
+    return float(value)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """Retry with randomized exponential backoff on retryable status codes"""
+    max_attempts: int = 3
+    initial_backoff: float = 0.1
+    max_backoff: float = 1.0
+    backoff_multiplier: float = 2.0
+    retryable_codes: FrozenSet[str] = frozenset({"UNAVAILABLE"})
+
+    def backoff(self, retry_number: int) -> float:
+        """Sleep before retry N, drawn uniformly from [0, capped exponential backoff]"""
+        ceiling = self.initial_backoff * self.backoff_multiplier ** (retry_number - 1)
+        return random.uniform(0, min(ceiling, self.max_backoff))
+
+
+@dataclass(frozen=True)
+class HedgingPolicy:
+    """Send up to max_attempts copies of a call, hedging_delay apart; first final answer wins"""
+    max_attempts: int = 2
+    hedging_delay: float = 0.05
+    non_fatal_codes: FrozenSet[str] = frozenset({"UNAVAILABLE"})
+
+
+@dataclass(frozen=True)
+class CallPolicy:
+    """Deadline plus optional retry or hedging policy for one method"""
+    timeout: Optional[float] = None
+    retry: Optional[RetryPolicy] = None
+    hedging: Optional[HedgingPolicy] = None
+
+    @property
+    def multi_attempt(self) -> bool:
+        return self.retry is not None or self.hedging is not None
+
+
+class AttemptFailed(Exception):
+    """Attempt finished without an exception but with a failing status (e.g. HTTP 503)"""
+
+
+class HedgeCancelled(Exception):
+    """Hedged attempt cancelled because another attempt already produced the answer"""
+
+
+class AttemptOutcome:
+    """Result of a single attempt of a logical call"""
+    __slots__ = ("number", "result", "exception", "status", "response_time")
+
+    def __init__(self, number, result=None, exception=None, status=None, response_time=0.0):
+        self.number = number
+        self.result = result
+        self.exception = exception
+        self.status = status
+        self.response_time = response_time
+
+
+def grpc_status(result, exception) -> Optional[str]:
+    """Status code name of a gRPC attempt, None on success"""
+    if exception is None:
+        return None
+    code = getattr(exception, "code", None)
+    if callable(code):
+        return code().name
+    return "UNKNOWN"
+
+
+def http_status(result, exception) -> Optional[str]:
+    """Status of an HTTP attempt: "UNAVAILABLE" for connection errors, the code for 4xx/5xx, None on success"""
+    if exception is not None or result.status_code == 0:
+        return "UNAVAILABLE"
+    if result.status_code >= 400:
+        return str(result.status_code)
+    return None
+
+
+class CallPolicies:
+    """
+    Method name -> CallPolicy registry and the engine executing calls under it
+
+    Policies are looked up by the Locust request name first (e.g. "GetTerm [stress]",
+    "GET /graph [HEAVY]") and then by the bare method ("GetTerm", "GET /graph").
+    Calls with a multi-attempt policy report every attempt separately with request
+    type "<type>-attempt" under the same name, so Locust's statistics show the
+    logical request and its attempts side by side.
+    """
+
+    def __init__(self, policies: Dict[str, CallPolicy] = None, default: CallPolicy = None):
+        self.policies = policies or {}
+        self.default = default
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "CallPolicies":
+        """Build from a gRPC service-config-like dict ({"methodConfig": [...]})"""
+        policies = {}
+        default = None
+        for method_config in data.get("methodConfig", []):
+            policy = CallPolicy(
+                timeout=parse_duration(method_config.get("timeout")),
+                retry=cls._parse_retry(method_config.get("retryPolicy")),
+                hedging=cls._parse_hedging(method_config.get("hedgingPolicy")),
+            )
+            if policy.retry and policy.hedging:
+                raise ValueError(f"{method_config.get('name')}: retryPolicy and hedgingPolicy are mutually exclusive")
+            names = method_config.get("name") or []
+            if not names:
+                default = policy
+            for name in names:
+                policies[name] = policy
+        return cls(policies, default)
+
+    @classmethod
+    def load(cls, path: str) -> "CallPolicies":
+        """Load policies from a JSON file"""
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @staticmethod
+    def _parse_retry(data) -> Optional[RetryPolicy]:
+        if not data:
+            return None
+        return RetryPolicy(
+            max_attempts=int(data.get("maxAttempts", 3)),
+            initial_backoff=parse_duration(data.get("initialBackoff", 0.1)),
+            max_backoff=parse_duration(data.get("maxBackoff", 1.0)),
+            backoff_multiplier=float(data.get("backoffMultiplier", 2.0)),
+            retryable_codes=frozenset(str(c) for c in data.get("retryableStatusCodes", ["UNAVAILABLE"])),
+        )
+
+    @staticmethod
+    def _parse_hedging(data) -> Optional[HedgingPolicy]:
+        if not data:
+            return None
+        return HedgingPolicy(
+            max_attempts=int(data.get("maxAttempts", 2)),
+            hedging_delay=parse_duration(data.get("hedgingDelay", 0.05)),
+            non_fatal_codes=frozenset(str(c) for c in data.get("nonFatalStatusCodes", ["UNAVAILABLE"])),
+        )
+
+    def policy_for(self, name: str, method: str = None) -> Optional[CallPolicy]:
+        policy = self.policies.get(name)
+        if policy is None and method is not None:
+            policy = self.policies.get(method)
+        return policy or self.default
+
+    def execute(
+        self,
+        attempt: Callable[[Optional[float], int], Any],
+        status_of: Callable[[Any, Optional[BaseException]], Optional[str]],
+        request_event,
+        request_type: str,
+        name: str,
+        method: str = None,
+        default_timeout: float = None,
+        hedging: bool = True,
+        cancel_losers: bool = True,
+        success_statuses: Collection[str] = (),
+    ):
+        """
+        Run attempt(timeout, attempt_number) under the policy for name/method
+
+        Returns the result of the winning attempt or raises its exception.
+        Without a multi-attempt policy this is a plain single call.
+
+        hedging=False runs hedged methods as a single attempt (for transports
+        that cannot run attempts concurrently). cancel_losers=False lets
+        attempts that cannot really be cancelled run to completion, and they
+        are reported with their actual outcome. success_statuses are statuses
+        the caller accepts as an answer (e.g. "404", "NOT_FOUND"); attempts
+        ending with them are not reported as failed.
+        """
+        policy = self.policy_for(name, method)
+        timeout = policy.timeout if policy and policy.timeout is not None else default_timeout
+        if policy is None or not policy.multi_attempt or (policy.hedging is not None and not hedging):
+            return attempt(timeout, 1)
+
+        deadline = time.perf_counter() + timeout if timeout is not None else None
+
+        def report(outcome: AttemptOutcome, exception=None):
+            if exception is None and outcome.status is not None and outcome.status not in success_statuses:
+                exception = outcome.exception or AttemptFailed(outcome.status)
+            response = outcome.result
+            request_event.fire(
+                request_type=f"{request_type}-attempt",
+                name=name,
+                response_time=outcome.response_time,
+                response_length=len(getattr(response, "content", b"") or b"") if response is not None else 0,
+                exception=exception,
+                context={"attempt": outcome.number},
+            )
+
+        if policy.retry is not None:
+            outcome = self._retry(policy.retry, attempt, status_of, deadline, report)
+        else:
+            outcome = self._hedge(policy.hedging, attempt, status_of, deadline, report, cancel_losers)
+
+        if outcome.exception is not None:
+            raise outcome.exception
+        return outcome.result
+
+    @staticmethod
+    def _run_attempt(attempt, status_of, deadline, number) -> AttemptOutcome:
+        remaining = max(deadline - time.perf_counter(), 0.0) if deadline is not None else None
+        outcome = AttemptOutcome(number)
+        start = time.perf_counter()
+        try:
+            outcome.result = attempt(remaining, number)
+        except Exception as e:
+            outcome.exception = e
+        outcome.response_time = (time.perf_counter() - start) * 1000
+        outcome.status = status_of(outcome.result, outcome.exception)
+        return outcome
+
+    def _retry(self, retry: RetryPolicy, attempt, status_of, deadline, report) -> AttemptOutcome:
+        number = 1
+        while True:
+            outcome = self._run_attempt(attempt, status_of, deadline, number)
+            report(outcome)
+            if outcome.status not in retry.retryable_codes or number >= retry.max_attempts:
+                return outcome
+            backoff = retry.backoff(number)
+            if deadline is not None and time.perf_counter() + backoff >= deadline:
+                return outcome
+            gevent.sleep(backoff)
+            number += 1
+
+    def _hedge(self, hedging: HedgingPolicy, attempt, status_of, deadline, report, cancel_losers=True) -> AttemptOutcome:
+        pending = {}
+        winner = None
+        last = None
+        launched = 0
+
+        while winner is None:
+            if launched < hedging.max_attempts and (deadline is None or time.perf_counter() < deadline):
+                launched += 1
+                greenlet = gevent.spawn(self._run_attempt, attempt, status_of, deadline, launched)
+                pending[greenlet] = (launched, time.perf_counter())
+            if not pending:
+                break
+
+            wait_timeout = hedging.hedging_delay if launched < hedging.max_attempts else None
+            for greenlet in gevent.wait(list(pending), timeout=wait_timeout, count=1):
+                del pending[greenlet]
+                outcome = greenlet.value
+                report(outcome)
+                if outcome.status in hedging.non_fatal_codes:
+                    last = outcome
+                else:
+                    winner = outcome
+                    break
+
+        for greenlet, (number, start) in pending.items():
+            if not cancel_losers:
+                greenlet.link_value(lambda finished: report(finished.value))
+                continue
+            greenlet.kill(block=True)
+            cancelled = AttemptOutcome(number, response_time=(time.perf_counter() - start) * 1000)
+            report(cancelled, exception=HedgeCancelled("hedged attempt cancelled"))
+
+        return winner or last
+
+
+class PolicyHttpSession(HttpSession):
+    """
+    HttpSession applying CallPolicies to requests by their Locust name
+
+    The bare-method fallback uses the normalized endpoint, e.g. a request to
+    /terms/Python matches a "GET /terms/{term}" policy. success_statuses lists
+    HTTP status codes the caller treats as success (e.g. 404 for optional terms),
+    so those attempts are not counted as failed attempts.
+    """
+
+    def __init__(self, *args, policies: CallPolicies = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.policies = policies or CallPolicies()
+
+    def request(self, method, url, name=None, catch_response=False, context={}, success_statuses=(), **kwargs):
+        key = name or url
+        endpoint = normalize_endpoint(method, urlsplit(url).path)
+        policy = self.policies.policy_for(key, endpoint)
+        if policy is None or not policy.multi_attempt:
+            if policy is not None and policy.timeout is not None:
+                kwargs.setdefault("timeout", policy.timeout)
+            return super().request(method, url, name=name, catch_response=catch_response, context=context, **kwargs)
+
+        start_time = time.time()
+        start = time.perf_counter()
+        timeout = kwargs.pop("timeout", None)
+
+        def attempt(timeout, number):
+            return super(PolicyHttpSession, self).request(
+                method, url, name=name, catch_response=True,
+                context={**context, "attempt": number}, timeout=timeout, **kwargs
+            )
+
+        response = self.policies.execute(
+            attempt, http_status, self.request_event, method, key, method=endpoint, default_timeout=timeout,
+            success_statuses=[str(status) for status in success_statuses],
+        )
+        response.request_meta["response_time"] = (time.perf_counter() - start) * 1000
+        response.request_meta["start_time"] = start_time
+        if catch_response:
+            return response
+        with response:
+            pass
+        return response
+
+
+def print_attempt_amplification(stats):
+    """Print attempts per logical request for names that ran under a multi-attempt policy"""
+    rows = []
+    for (name, request_type), entry in sorted(stats.entries.items()):
+        if not request_type.endswith("-attempt"):
+            continue
+        logical = stats.entries.get((name, request_type[:-len("-attempt")]))
+        if logical is None or not logical.num_requests:
+            continue
+        rows.append((name, logical, entry))
+
+    if not rows:
+        return
+
+    print("=" * 90)
+    print("CALL POLICY: ATTEMPTS PER LOGICAL REQUEST")
+    print("=" * 90)
+    print(f"{'Name':<40} {'logical':>9} {'attempts':>9} {'amplif.':>8} {'p99 log':>9} {'p99 att':>9}")
+    for name, logical, attempts in rows:
+        print(
+            f"{name:<40} {logical.num_requests:>9} {attempts.num_requests:>9} "
+            f"{attempts.num_requests / logical.num_requests:>8.2f} "
+            f"{logical.get_response_time_percentile(0.99):>9.0f} "
+            f"{attempts.get_response_time_percentile(0.99):>9.0f}"
+        )
+    print("=" * 90)
+
+
+@lru_cache(maxsize=None)
+def load_policies(path: Optional[str]) -> CallPolicies:
+    """Load (once per process) the policies file, or an empty registry when unset"""
+    if not path:
+        return CallPolicies()
+    return CallPolicies.load(path)
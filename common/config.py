@@ -1,20 +1,184 @@
 """Configuration management for load tests"""
 import os
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Mapping
 
+GRPC_BACKEND_NAMES = ('direct', 'gevent', 'threadpool')
+
+
+class ConfigError(ValueError):
+    """Invalid load test configuration"""
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    """Immutable configuration values, parsed once and shipped from master to workers"""
+    REST_BASE_URL: str
+    GRPC_TARGET: str
+    GRPC_HOST: str
+    GRPC_PORT: int
+    GRPC_BACKEND: str
+    GRPC_THREADPOOL_SIZE: int
+    WAIT_TIME_MIN: float
+    WAIT_TIME_MAX: float
+    TERM_PREFIX: str
+    CALL_POLICY_FILE: str
+    SESSION_MODEL: str
+    WORKLOAD_MIX: str
+    WORKLOAD_SEED: int
+    METRICS_HOST: str
+    METRICS_PORT: int
+    SLO_FILE: str
+    SLO_VERDICT: str
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = None) -> "ConfigSnapshot":
+        """
+        Parse environment variables, reporting every malformed value at once
+
+        When a value cannot be parsed, the ConfigError also lists the range
+        and file problems of the other values (see validate()).
+        """
+        environ = os.environ if environ is None else environ
+        errors = []
+        malformed = []
+
+        def number(name, default, convert):
+            raw = environ.get(name, default)
+            try:
+                return convert(raw)
+            except ValueError:
+                errors.append(f"{name}={raw!r} is not a valid {convert.__name__}")
+                malformed.append(name)
+                return convert(default)
+
+        grpc_target = environ.get('GRPC_TARGET', 'localhost:50051')
+        grpc_host, _, grpc_port = grpc_target.partition(':')
+        if grpc_port:
+            try:
+                grpc_port = int(grpc_port)
+            except ValueError:
+                errors.append(f"GRPC_TARGET={grpc_target!r} has a non-numeric port")
+                malformed.append('GRPC_TARGET')
+                grpc_port = 50051
+        else:
+            grpc_port = 50051
+
+        snapshot = cls(
+            REST_BASE_URL=environ.get('REST_BASE_URL', 'http://localhost:8000'),
+            GRPC_TARGET=grpc_target,
+            GRPC_HOST=grpc_host,
+            GRPC_PORT=grpc_port,
+            GRPC_BACKEND=environ.get('GRPC_BACKEND', 'direct'),
+            GRPC_THREADPOOL_SIZE=number('GRPC_THREADPOOL_SIZE', '32', int),
+            WAIT_TIME_MIN=number('WAIT_TIME_MIN', '1', float),
+            WAIT_TIME_MAX=number('WAIT_TIME_MAX', '3', float),
+            TERM_PREFIX=environ.get('TERM_PREFIX', 'LoadTest'),
+            CALL_POLICY_FILE=environ.get('CALL_POLICY_FILE', ''),
+            SESSION_MODEL=environ.get('SESSION_MODEL', ''),
+            WORKLOAD_MIX=environ.get('WORKLOAD_MIX', ''),
+            WORKLOAD_SEED=number('WORKLOAD_SEED', '42', int),
+            METRICS_HOST=environ.get('METRICS_HOST', '127.0.0.1'),
+            METRICS_PORT=number('METRICS_PORT', '0', int),
+            SLO_FILE=environ.get('SLO_FILE', ''),
+            SLO_VERDICT=environ.get('SLO_VERDICT', ''),
+        )
+        if errors:
+            # malformed values were replaced by their defaults; skip checks on them
+            errors += [
+                problem for problem in snapshot.problems()
+                if not any(problem.startswith(name) for name in malformed)
+            ]
+            raise ConfigError("; ".join(errors))
+        return snapshot
+
+    def validate(self) -> "ConfigSnapshot":
+        """Check value ranges and referenced files; raises ConfigError listing all problems"""
+        errors = self.problems()
+        if errors:
+            raise ConfigError("; ".join(errors))
+        return self
+
+    def problems(self) -> List[str]:
+        """Range and referenced-file problems, one message per value"""
+        errors = []
+        if not self.REST_BASE_URL.startswith(('http://', 'https://')):
+            errors.append(f"REST_BASE_URL={self.REST_BASE_URL!r} must start with http:// or https://")
+        if not self.GRPC_HOST or not 0 < self.GRPC_PORT < 65536:
+            errors.append(f"GRPC_TARGET={self.GRPC_TARGET!r} must be host:port")
+        if self.GRPC_BACKEND not in GRPC_BACKEND_NAMES:
+            errors.append(f"GRPC_BACKEND={self.GRPC_BACKEND!r} must be one of {', '.join(GRPC_BACKEND_NAMES)}")
+        if self.GRPC_THREADPOOL_SIZE < 1:
+            errors.append("GRPC_THREADPOOL_SIZE must be positive")
+        if not 0 <= self.WAIT_TIME_MIN <= self.WAIT_TIME_MAX:
+            errors.append(f"WAIT_TIME_MIN/MAX={self.WAIT_TIME_MIN}/{self.WAIT_TIME_MAX} must satisfy 0 <= min <= max")
+        if not 0 <= self.METRICS_PORT < 65536:
+            errors.append(f"METRICS_PORT={self.METRICS_PORT} must be 0 (disabled) or a TCP port")
+        if self.CALL_POLICY_FILE:
+            from .call_policy import CallPolicies
+            try:
+                CallPolicies.load(self.CALL_POLICY_FILE)
+            except (OSError, ValueError) as e:
+                errors.append(f"CALL_POLICY_FILE={self.CALL_POLICY_FILE!r}: {e}")
+        if self.SESSION_MODEL:
+            from .session_model import SessionModel
+            try:
+                SessionModel.load(self.SESSION_MODEL)
+            except (OSError, ValueError, KeyError) as e:
+                errors.append(f"SESSION_MODEL={self.SESSION_MODEL!r}: {e}")
+        if self.SLO_FILE:
+            from .slo import SloSet
+            try:
+                SloSet.load(self.SLO_FILE)
+            except (OSError, ValueError, TypeError) as e:
+                errors.append(f"SLO_FILE={self.SLO_FILE!r}: {e}")
+        if self.WORKLOAD_MIX:
+            from .glossary_client import parse_mix
+            try:
+                parse_mix(self.WORKLOAD_MIX)
+            except ValueError as e:
+                errors.append(f"WORKLOAD_MIX={self.WORKLOAD_MIX!r}: {e}")
+        return errors
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "ConfigSnapshot":
+        return cls(**data)
+
+
+class _LazyConfig(type):
+    """Resolve Config.<NAME> against the installed snapshot, parsing the environment on first use"""
+
+    def __getattr__(cls, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(cls.current(), name)
+
+
+class Config(metaclass=_LazyConfig):
+    """
+    Centralized configuration for REST and gRPC load tests
+
+    Nothing is read at import time. The first attribute access parses the
+    environment, unless a snapshot was installed explicitly (workers receive
+    the master's validated snapshot, see common.startup).
+    """
+
+    _snapshot = None
+
+    @classmethod
+    def current(cls) -> ConfigSnapshot:
+        if cls._snapshot is None:
+            cls._snapshot = ConfigSnapshot.from_env()
+        return cls._snapshot
+
+    @classmethod
+    def install(cls, snapshot: ConfigSnapshot):
+        """Replace the active configuration (e.g. with the snapshot sent by the master)"""
+        cls._snapshot = snapshot
 
-class Config:
-    """Centralized configuration for REST and gRPC load tests"""
-    
-    REST_BASE_URL = os.getenv('REST_BASE_URL', 'http://localhost:8000')
-    
-    GRPC_TARGET = os.getenv('GRPC_TARGET', 'localhost:50051')
-    GRPC_HOST = GRPC_TARGET.split(':')[0]
-    GRPC_PORT = int(GRPC_TARGET.split(':')[1]) if ':' in GRPC_TARGET else 50051
-    
-    WAIT_TIME_MIN = float(os.getenv('WAIT_TIME_MIN', '1'))
-    WAIT_TIME_MAX = float(os.getenv('WAIT_TIME_MAX', '3'))
-    TERM_PREFIX = os.getenv('TERM_PREFIX', 'LoadTest')
-    
     @classmethod
     def print_config(cls):
         """Print current configuration (useful for debugging)"""
@@ -25,7 +189,12 @@ class Config:
         print(f"GRPC_TARGET:    {cls.GRPC_TARGET}")
         print(f"GRPC_HOST:      {cls.GRPC_HOST}")
         print(f"GRPC_PORT:      {cls.GRPC_PORT}")
+        print(f"GRPC_BACKEND:   {cls.GRPC_BACKEND}")
         print(f"WAIT_TIME:      {cls.WAIT_TIME_MIN}s - {cls.WAIT_TIME_MAX}s")
         print(f"TERM_PREFIX:    {cls.TERM_PREFIX}")
+        print(f"CALL_POLICY:    {cls.CALL_POLICY_FILE or '(none)'}")
+        print(f"SESSION_MODEL:  {cls.SESSION_MODEL or '(none)'}")
+        print(f"WORKLOAD:       {cls.WORKLOAD_MIX or '(default mix)'} (seed {cls.WORKLOAD_SEED})")
+        print(f"SLO_FILE:       {cls.SLO_FILE or '(none)'}")
+        print(f"METRICS:        {f'{cls.METRICS_HOST}:{cls.METRICS_PORT}' if cls.METRICS_PORT else '(disabled)'}")
         print("=" * 50)
-
@@ -0,0 +1,322 @@
+"""
+Protocol-agnostic glossary client and shared workload definition
+
+Both transports expose the same operations, report them under the same
+Locust names (request type "rest" or "grpc"), measure response sizes in
+wire bytes and treat "term not found" the same way, so a run with both
+user classes compares protocols operation by operation.
+
+Operations with no native counterpart are composed from the calls the
+protocol does offer, as a client of that API would have to:
+- gRPC graph: ListTerms + GetTermRelations for every term
+- REST search_terms: GET /terms, filtered on the client
+- REST term_relations: GET /graph, edges of the term filtered on the client
+"""
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+from .call_policy import CallPolicies, http_status
+from .data_generator import DataGenerator
+from .session_model import normalize_endpoint
+
+OPERATIONS = ("list_terms", "get_term", "search_terms", "term_relations", "graph", "add_term")
+
+DEFAULT_MIX = {
+    "list_terms": 30,
+    "get_term": 30,
+    "search_terms": 20,
+    "term_relations": 10,
+    "graph": 10,
+    "add_term": 0,
+}
+
+SEARCH_QUERIES = ["gRPC", "Protocol", "HTTP", "API", "RPC", "REST", "Python", "Docker"]
+
+
+def parse_mix(value: str) -> Dict[str, int]:
+    """Parse "list_terms=30,get_term=30,..." into operation weights"""
+    if not value:
+        return dict(DEFAULT_MIX)
+    mix = {operation: 0 for operation in OPERATIONS}
+    for item in value.split(","):
+        operation, _, weight = item.partition("=")
+        operation = operation.strip()
+        if operation not in OPERATIONS:
+            raise ValueError(f"Unknown operation {operation!r}, expected one of: {', '.join(OPERATIONS)}")
+        mix[operation] = int(weight)
+    if not any(mix.values()):
+        raise ValueError("Operation mix has no positive weight")
+    return mix
+
+
+def build_operation_sequence(seed: int, length: int, mix: Dict[str, int]) -> List[Tuple[str, Optional[object]]]:
+    """
+    Precompute (operation, argument) pairs from a seeded RNG
+
+    Term arguments are integer slots resolved against each user's term list,
+    so both transports pick the same term for the same step.
+    """
+    rng = random.Random(seed)
+    operations = [operation for operation in OPERATIONS if mix.get(operation)]
+    weights = [mix[operation] for operation in operations]
+    sequence = []
+    for index, operation in enumerate(rng.choices(operations, weights=weights, k=length)):
+        if operation in ("get_term", "term_relations"):
+            argument = rng.randrange(1 << 30)
+        elif operation == "search_terms":
+            argument = rng.choice(SEARCH_QUERIES)
+        elif operation == "add_term":
+            argument = f"Unified_Term_{seed}_{index}"
+        else:
+            argument = None
+        sequence.append((operation, argument))
+    return sequence
+
+
+class TermNotFound(Exception):
+    """The requested term does not exist (counted as a successful request)"""
+
+
+class GlossaryClient(ABC):
+    """Common glossary operations; every call is reported as one Locust request"""
+
+    request_type = ""
+
+    def __init__(self, request_event, term_prefix: str = "LoadTest"):
+        self.request_event = request_event
+        self.term_prefix = term_prefix
+        self.terms: List[str] = []
+        self.operation = None
+
+    def execute(self, operation: str, argument=None):
+        """Run one operation and fire its request event"""
+        if operation in ("get_term", "term_relations"):
+            argument = self.terms[argument % len(self.terms)] if self.terms else "grpc"
+        self.operation = operation
+        start = time.perf_counter()
+        exception = None
+        response_length = 0
+        try:
+            method = getattr(self, operation)
+            response_length = method() if argument is None else method(argument)
+        except TermNotFound:
+            pass
+        except Exception as e:
+            exception = e
+        self.request_event.fire(
+            request_type=self.request_type,
+            name=operation,
+            response_time=(time.perf_counter() - start) * 1000,
+            response_length=response_length,
+            exception=exception,
+            context={},
+        )
+
+    def refresh_terms(self):
+        """Load term ids without reporting a request (session initialisation)"""
+        self.operation = None
+        self.terms = self._fetch_term_ids()
+
+    @abstractmethod
+    def _fetch_term_ids(self) -> List[str]:
+        ...
+
+    @abstractmethod
+    def list_terms(self) -> int:
+        ...
+
+    @abstractmethod
+    def get_term(self, term_id: str) -> int:
+        ...
+
+    @abstractmethod
+    def search_terms(self, query: str) -> int:
+        ...
+
+    @abstractmethod
+    def term_relations(self, term_id: str) -> int:
+        ...
+
+    @abstractmethod
+    def graph(self) -> int:
+        ...
+
+    @abstractmethod
+    def add_term(self, term: str) -> int:
+        ...
+
+
+class RestGlossaryClient(GlossaryClient):
+    """REST transport (FastAPI service: GET /terms, GET /terms/{term}, GET /graph, POST /terms)"""
+
+    request_type = "rest"
+    SEARCH_LIMIT = 10
+
+    def __init__(self, base_url: str, request_event, session: requests.Session = None,
+                 policies: CallPolicies = None, timeout: float = 10, **kwargs):
+        super().__init__(request_event, **kwargs)
+        self.base_url = base_url.rstrip("/")
+        if session is None:
+            # like the REST locustfile's sessions: ignore proxy/netrc settings from the environment
+            session = requests.Session()
+            session.trust_env = False
+        self.session = session
+        self.policies = policies or CallPolicies()
+        self.timeout = timeout
+
+    def _request(self, method, path, not_found_ok=False, **kwargs):
+        url = self.base_url + path
+        response = self.policies.execute(
+            lambda timeout, attempt: self.session.request(method, url, timeout=timeout, **kwargs),
+            http_status,
+            self.request_event,
+            self.request_type,
+            self.operation or path,
+            method=normalize_endpoint(method, path),
+            default_timeout=self.timeout,
+            success_statuses=("404",) if not_found_ok else (),
+        )
+        if response.status_code == 404 and not_found_ok:
+            raise TermNotFound(path)
+        response.raise_for_status()
+        return response
+
+    def _fetch_term_ids(self):
+        data = self._request("GET", "/terms").json()
+        return [term.get('term', term.get('id')) for term in data if term.get('term') or term.get('id')]
+
+    def list_terms(self):
+        return len(self._request("GET", "/terms").content)
+
+    def get_term(self, term_id):
+        return len(self._request("GET", f"/terms/{term_id}", not_found_ok=True).content)
+
+    # search_terms and term_relations download the whole collection and filter
+    # it here; both the transfer and the filtering are part of the measured time
+
+    def search_terms(self, query):
+        response = self._request("GET", "/terms")
+        self.matching_terms(response.json(), query)
+        return len(response.content)
+
+    def term_relations(self, term_id):
+        response = self._request("GET", "/graph")
+        self.term_edges(response.json(), term_id)
+        return len(response.content)
+
+    def matching_terms(self, terms: List[dict], query: str) -> List[dict]:
+        query = query.lower()
+        return [
+            term for term in terms
+            if query in str(term.get('term', '')).lower() or query in str(term.get('definition', '')).lower()
+        ][:self.SEARCH_LIMIT]
+
+    @staticmethod
+    def term_edges(graph: dict, term_id: str) -> List[dict]:
+        return [edge for edge in graph.get('edges', []) if term_id in (edge.get('source'), edge.get('target'))]
+
+    def graph(self):
+        return len(self._request("GET", "/graph").content)
+
+    def add_term(self, term):
+        payload = DataGenerator.generate_term_payload(term, prefix=self.term_prefix)
+        return len(self._request("POST", "/terms", json=payload).content)
+
+
+class GrpcGlossaryClient(GlossaryClient):
+    """gRPC transport on top of GrpcClient (call policies and execution backend apply)"""
+
+    request_type = "grpc"
+
+    def __init__(self, client, request_event, timeout: float = 10, **kwargs):
+        super().__init__(request_event, **kwargs)
+        self.client = client
+        self.timeout = timeout
+        from .grpc_client import glossary_pb2, grpc
+        self.pb = glossary_pb2
+        self.not_found = grpc.StatusCode.NOT_FOUND
+
+    def _call(self, method, request, not_found_ok=False):
+        try:
+            return self.client.call(
+                method, request, name=self.operation, timeout=self.timeout,
+                success_statuses=("NOT_FOUND",) if not_found_ok else (),
+            )
+        except Exception as e:
+            code = getattr(e, "code", None)
+            if not_found_ok and callable(code) and code() == self.not_found:
+                raise TermNotFound(request) from e
+            raise
+
+    def _fetch_term_ids(self):
+        response = self._call("ListTerms", self.pb.ListTermsRequest())
+        return [term.term for term in response.terms]
+
+    def list_terms(self):
+        return self._call("ListTerms", self.pb.ListTermsRequest()).ByteSize()
+
+    def get_term(self, term_id):
+        return self._call("GetTerm", self.pb.GetTermRequest(term_id=term_id), not_found_ok=True).ByteSize()
+
+    def search_terms(self, query):
+        return self._call("SearchTerms", self.pb.SearchTermsRequest(query=query, limit=10)).ByteSize()
+
+    def term_relations(self, term_id):
+        request = self.pb.GetTermRelationsRequest(term_id=term_id)
+        return self._call("GetTermRelations", request, not_found_ok=True).ByteSize()
+
+    def graph(self):
+        response = self._call("ListTerms", self.pb.ListTermsRequest())
+        size = response.ByteSize()
+        for term in response.terms:
+            request = self.pb.GetTermRelationsRequest(term_id=term.term)
+            try:
+                size += self._call("GetTermRelations", request, not_found_ok=True).ByteSize()
+            except TermNotFound:
+                pass
+        return size
+
+    def add_term(self, term):
+        payload = DataGenerator.generate_term_payload(term, prefix=self.term_prefix)
+        request = self.pb.AddTermRequest(
+            term=payload["term"],
+            description=payload["definition"],
+            sources=payload["source"].split(", "),
+        )
+        return self._call("AddTerm", request).ByteSize()
+
+
+def print_protocol_comparison(stats):
+    """Print REST vs gRPC side by side for every unified operation"""
+    rows = []
+    for operation in OPERATIONS:
+        rest = stats.entries.get((operation, RestGlossaryClient.request_type))
+        grpc_entry = stats.entries.get((operation, GrpcGlossaryClient.request_type))
+        if rest or grpc_entry:
+            rows.append((operation, rest, grpc_entry))
+    if not rows:
+        return
+
+    def cells(entry):
+        if entry is None or not entry.num_requests:
+            return f"{'-':>7} {'-':>7} {'-':>7} {'-':>7} {'-':>8} {'-':>6}"
+        return (
+            f"{entry.num_requests:>7} {entry.avg_response_time:>7.0f} "
+            f"{entry.get_response_time_percentile(0.95):>7.0f} {entry.get_response_time_percentile(0.99):>7.0f} "
+            f"{entry.avg_content_length:>8.0f} {entry.fail_ratio:>6.1%}"
+        )
+
+    header = f"{'reqs':>7} {'avg':>7} {'p95':>7} {'p99':>7} {'bytes':>8} {'fail':>6}"
+    print("=" * 125)
+    print("REST vs gRPC PER OPERATION (response times in ms)")
+    print("=" * 125)
+    print(f"{'':<16}| {'REST':^50} | {'gRPC':^50}")
+    print(f"{'Operation':<16}| {header} | {header}")
+    print("-" * 125)
+    for operation, rest, grpc_entry in rows:
+        print(f"{operation:<16}| {cells(rest)} | {cells(grpc_entry)}")
+    print("=" * 125)
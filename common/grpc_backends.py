@@ -0,0 +1,123 @@
+"""
+Execution backends for blocking gRPC stubs inside gevent-based Locust workers
+
+grpcio's C core blocks the calling OS thread, so with the default ("direct")
+backend a single greenlet waiting on a response stalls every other user in the
+worker process. The other backends keep the same stub/task API and only change
+where the call is executed:
+
+- direct:     call the stub in the greenlet (original behaviour)
+- gevent:     grpcio's experimental gevent integration (cooperative C-core polling)
+- threadpool: run the blocking call on a native gevent ThreadPool, the greenlet
+              waits cooperatively for the result
+
+Hedged calls need attempts that run concurrently (`concurrent`) and losers that
+can be cancelled (`cancellable`):
+
+- direct:     neither; hedging policies fall back to a single attempt
+- gevent:     calls go through stub.Method.future(), and killing the waiting
+              greenlet cancels the RPC
+- threadpool: attempts overlap, but a blocking call on a pool thread cannot be
+              cancelled (futures need grpc's channel spin thread, which is a
+              greenlet after monkey-patching), so losers run to completion
+
+Channels are closed when their GrpcClient is garbage-collected, except on the
+gevent backend: closing there needs the gevent hub, and a close from the
+garbage collector at interpreter exit never returns. Every backend closes the
+channels that are still open from Locust's quitting event instead, while the
+hub still runs.
+
+There is deliberately no grpc.aio backend: the aio completion-queue poller is
+started through the threading module, which Locust's monkey-patching turns into
+greenlets, so an asyncio sidecar loop deadlocks inside a Locust worker.
+"""
+import weakref
+from typing import Any, Callable, Optional
+
+from gevent import GreenletExit
+from gevent.threadpool import ThreadPool
+import grpc
+from locust import events
+
+
+class DirectBackend:
+    """Blocking stub calls from the greenlet itself"""
+    name = "direct"
+    concurrent = False
+    cancellable = False
+    close_on_gc = True
+
+    def __init__(self):
+        self.channels = weakref.WeakSet()
+
+    def create_channel(self, target: str):
+        channel = grpc.insecure_channel(target)
+        self.channels.add(channel)
+        return channel
+
+    def invoke(self, stub_method: Callable, request: Any, timeout: Optional[float]):
+        return stub_method(request, timeout=timeout)
+
+    def close_channel(self, channel):
+        self.channels.discard(channel)
+        channel.close()
+
+    def close(self, **kwargs):
+        """Close every channel still open (Locust quitting listener)"""
+        for channel in list(self.channels):
+            self.close_channel(channel)
+
+
+class GeventBackend(DirectBackend):
+    """grpcio's gevent integration: the C core yields to the gevent hub while waiting"""
+    name = "gevent"
+    concurrent = True
+    cancellable = True
+    close_on_gc = False
+
+    def __init__(self):
+        super().__init__()
+        import grpc.experimental.gevent as grpc_gevent
+        grpc_gevent.init_gevent()
+
+    def invoke(self, stub_method: Callable, request: Any, timeout: Optional[float]):
+        future = stub_method.future(request, timeout=timeout)
+        try:
+            return future.result()
+        except GreenletExit:
+            future.cancel()
+            raise
+
+
+class ThreadPoolBackend(DirectBackend):
+    """Blocking stub calls on native threads; greenlets wait cooperatively"""
+    name = "threadpool"
+    concurrent = True
+
+    def __init__(self, size: int = 32):
+        super().__init__()
+        self.pool = ThreadPool(size)
+
+    def invoke(self, stub_method: Callable, request: Any, timeout: Optional[float]):
+        return self.pool.spawn(stub_method, request, timeout=timeout).get()
+
+
+BACKENDS = {
+    backend.name: backend
+    for backend in (DirectBackend, GeventBackend, ThreadPoolBackend)
+}
+
+_instances = {}
+
+
+def get_backend(name: str = "direct", threadpool_size: int = 32):
+    """Process-wide backend instance (the thread pool is shared by all users)"""
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown gRPC backend {name!r}, expected one of: {', '.join(BACKENDS)}")
+    if name not in _instances:
+        if name == ThreadPoolBackend.name:
+            _instances[name] = ThreadPoolBackend(threadpool_size)
+        else:
+            _instances[name] = BACKENDS[name]()
+        events.quitting.add_listener(_instances[name].close)
+    return _instances[name]
@@ -0,0 +1,71 @@
+"""gRPC client wrapper shared by the gRPC locustfiles"""
+import logging
+
+from locust import events
+
+from .call_policy import grpc_status, load_policies
+from .config import Config
+from .startup import lazy_import
+
+PROTO_HINT = "generate glossary_pb2*.py with grpc_tools.protoc from the service's glossary.proto"
+
+grpc = lazy_import("grpc")
+glossary_pb2 = lazy_import("glossary_pb2", hint=PROTO_HINT)
+glossary_pb2_grpc = lazy_import("glossary_pb2_grpc", hint=PROTO_HINT)
+grpc_backends = lazy_import("common.grpc_backends")
+
+PROTOCOL_MODULES = [grpc, glossary_pb2, glossary_pb2_grpc]
+
+logger = logging.getLogger(__name__)
+_hedging_warned = False
+
+
+class GrpcClient:
+    """gRPC client wrapper for Locust"""
+    
+    def __init__(self, host, policies=None, backend=None):
+        self.host = host
+        self.backend = backend or grpc_backends.get_backend(Config.GRPC_BACKEND, Config.GRPC_THREADPOOL_SIZE)
+        self.channel = self.backend.create_channel(host)
+        self.stub = glossary_pb2_grpc.GlossaryServiceStub(self.channel)
+        self.policies = policies if policies is not None else load_policies(Config.CALL_POLICY_FILE)
+        self._warn_hedging()
+    
+    def _warn_hedging(self):
+        global _hedging_warned
+        if self.backend.concurrent or _hedging_warned:
+            return
+        policies = list(self.policies.policies.values()) + [self.policies.default]
+        if any(policy is not None and policy.hedging is not None for policy in policies):
+            _hedging_warned = True
+            logger.warning(
+                f"GRPC_BACKEND={self.backend.name} runs calls one at a time: hedging policies "
+                f"fall back to a single attempt for gRPC (use GRPC_BACKEND=gevent)"
+            )
+    
+    def call(self, method, request, name=None, timeout=None, success_statuses=()):
+        """
+        Invoke a stub method under the configured call policy
+        
+        timeout is the default deadline, overridden by the policy for name/method.
+        Retried and hedged calls report each attempt as request_type "grpc-attempt";
+        attempts ending with one of success_statuses (e.g. "NOT_FOUND" when the
+        caller accepts a missing term) are not reported as failed.
+        """
+        stub_method = getattr(self.stub, method)
+        return self.policies.execute(
+            lambda remaining, attempt: self.backend.invoke(stub_method, request, remaining),
+            grpc_status,
+            events.request,
+            "grpc",
+            name or method,
+            method=method,
+            default_timeout=timeout,
+            hedging=self.backend.concurrent,
+            cancel_losers=self.backend.cancellable,
+            success_statuses=success_statuses,
+        )
+    
+    def __del__(self):
+        if hasattr(self, 'channel') and self.backend.close_on_gc:
+            self.backend.close_channel(self.channel)
@@ -0,0 +1,205 @@
+"""
+Live OpenMetrics exporter for in-flight load-test metrics
+
+Every Locust process (master, workers, local runner) serves its own
+/metrics endpoint when METRICS_PORT is set (on the master; workers use the
+master's config snapshot). Workers on the same host take
+the next free port. Workers and local runners export what they measured
+themselves. The master exports the cluster-wide view built from the worker
+reports, so scrape either the master or all workers, but not both into
+one sum.
+
+Series per (request type, name):
+- locust_requests_total, locust_request_failures_total
+- locust_response_bytes_total
+- locust_response_time_seconds histogram with fixed buckets
+
+The request listener runs in the gevent loop of one process, so plain
+integer updates are atomic and need no locks. Per request it does one dict
+lookup, one bisect and four increments. Cumulative bucket sums are only
+computed when /metrics is scraped.
+
+Usage:
+    METRICS_PORT=9646 locust -f locustfile_rest_simple.py ...
+    curl localhost:9646/metrics
+"""
+import bisect
+import logging
+import os
+from typing import Dict, Tuple
+
+from locust.runners import MasterRunner, WorkerRunner
+
+from .config import Config
+from .startup import config_installed
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+BUCKET_BOUNDS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+PORT_ATTEMPTS = 64
+
+
+class Series:
+    """Counters and non-cumulative bucket counts of one endpoint"""
+
+    __slots__ = ("requests", "failures", "response_bytes", "time_sum_ms", "buckets")
+
+    def __init__(self):
+        self.requests = 0
+        self.failures = 0
+        self.response_bytes = 0
+        self.time_sum_ms = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS_MS) + 1)
+
+
+class MetricsRegistry:
+    """Per-endpoint aggregation fed from events.request"""
+
+    def __init__(self, node: str, runner=None):
+        self.node = node
+        self.runner = runner
+        self.series: Dict[Tuple[str, str], Series] = {}
+
+    def collect(self) -> Dict[Tuple[str, str], Series]:
+        return self.series
+
+    def on_request(self, request_type, name, response_time, response_length, exception=None, **kwargs):
+        key = (request_type, name)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = Series()
+        series.requests += 1
+        if exception is not None:
+            series.failures += 1
+        series.response_bytes += response_length or 0
+        series.time_sum_ms += response_time
+        series.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, response_time)] += 1
+
+    def render(self) -> str:
+        """Current state in the OpenMetrics text format"""
+        series_by_key = self.collect()
+        node = f'node="{escape(self.node)}"'
+        labels = {
+            key: f'{node},type="{escape(key[0])}",name="{escape(key[1])}"'
+            for key in series_by_key
+        }
+        items = sorted(series_by_key.items())
+        lines = []
+
+        def counter(metric, help_text, attr):
+            lines.append(f"# TYPE {metric} counter")
+            lines.append(f"# HELP {metric} {help_text}")
+            for key, series in items:
+                lines.append(f"{metric}_total{{{labels[key]}}} {getattr(series, attr)}")
+
+        counter("locust_requests", "Completed requests", "requests")
+        counter("locust_request_failures", "Failed requests", "failures")
+        counter("locust_response_bytes", "Response payload bytes", "response_bytes")
+
+        metric = "locust_response_time_seconds"
+        lines.append(f"# TYPE {metric} histogram")
+        lines.append(f"# UNIT {metric} seconds")
+        lines.append(f"# HELP {metric} Response time")
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(BUCKET_BOUNDS_MS, series.buckets):
+                cumulative += count
+                lines.append(f'{metric}_bucket{{{labels[key]},le="{bound / 1000:g}"}} {cumulative}')
+            lines.append(f'{metric}_bucket{{{labels[key]},le="+Inf"}} {series.requests}')
+            lines.append(f"{metric}_count{{{labels[key]}}} {series.requests}")
+            lines.append(f"{metric}_sum{{{labels[key]}}} {series.time_sum_ms / 1000:.6f}")
+
+        if self.runner is not None:
+            lines.append("# TYPE locust_users gauge")
+            lines.append("# HELP locust_users Running users")
+            lines.append(f"locust_users{{{node}}} {self.runner.user_count}")
+
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def wsgi_app(self, environ, start_response):
+        if environ.get("PATH_INFO", "/") not in ("/", "/metrics"):
+            start_response("404 Not Found", [("Content-Type", "text/plain")])
+            return [b"not found\n"]
+        body = self.render().encode()
+        start_response("200 OK", [("Content-Type", CONTENT_TYPE), ("Content-Length", str(len(body)))])
+        return [body]
+
+
+class StatsRegistry(MetricsRegistry):
+    """Master-side registry converting the aggregated Locust stats at scrape time"""
+
+    def __init__(self, node: str, runner):
+        super().__init__(node, runner)
+        self.stats = runner.stats
+
+    def collect(self):
+        series_by_key = {}
+        for (name, request_type), entry in self.stats.entries.items():
+            series = Series()
+            series.requests = entry.num_requests
+            series.failures = entry.num_failures
+            series.response_bytes = entry.total_content_length
+            series.time_sum_ms = entry.total_response_time
+            for response_time, count in entry.response_times.items():
+                series.buckets[bisect.bisect_left(BUCKET_BOUNDS_MS, response_time)] += count
+            series_by_key[(request_type, name)] = series
+        return series_by_key
+
+
+def escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def serve(app, host: str, port: int):
+    """Start a WSGI server on the first free port from `port`; returns (server, port)"""
+    from gevent.pywsgi import WSGIServer
+
+    for candidate in range(port, port + PORT_ATTEMPTS):
+        server = WSGIServer((host, candidate), app, log=None, error_log=logger)
+        try:
+            server.start()
+        except OSError:
+            continue
+        return server, candidate
+    raise OSError(f"No free port in {port}-{port + PORT_ATTEMPTS - 1}")
+
+
+_registered = False
+
+
+def register_metrics_exporter(events):
+    """
+    Start the exporter once the node's configuration is final (safe to call from several locustfiles)
+
+    Workers wait for the master's config snapshot, so METRICS_PORT/METRICS_HOST
+    set on the master apply to every worker.
+    """
+    global _registered
+    if _registered:
+        return
+    _registered = True
+    config_installed.add_listener(_start_exporter)
+
+
+def _start_exporter(environment, **kwargs):
+    port = Config.METRICS_PORT
+    if not port or getattr(environment, "metrics_registry", None) is not None:
+        return
+    runner = environment.runner
+    if isinstance(runner, MasterRunner):
+        # The master receives batched worker reports instead of request events
+        registry = StatsRegistry("master", runner)
+    else:
+        node = f"worker-{os.getpid()}" if isinstance(runner, WorkerRunner) else "local"
+        registry = MetricsRegistry(node, runner)
+        environment.events.request.add_listener(registry.on_request)
+    environment.metrics_registry = registry
+    try:
+        server, bound = serve(registry.wsgi_app, Config.METRICS_HOST, port)
+    except OSError as e:
+        logger.warning(f"Metrics exporter disabled: {e}")
+        return
+    environment.events.quitting.add_listener(lambda **kw: server.stop(timeout=1))
+    logger.info(f"OpenMetrics exporter ({registry.node}) on http://{Config.METRICS_HOST}:{bound}/metrics")
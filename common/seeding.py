@@ -0,0 +1,348 @@
+"""
+Large-glossary seeding with graph-shape control
+
+Generates a reproducible glossary with DataGenerator payloads and a relation
+graph of the chosen topology, then loads it through REST (POST /terms) or
+gRPC (AddTerm) in concurrent batches, reporting progress and throughput.
+
+Topologies:
+- power_law: preferential attachment, few hub terms with very high degree
+- clusters:  dense topic clusters joined by a few bridge relations
+- chains:    long subclass_of / part_of hierarchies
+
+Relations always point from a term to terms generated before it. Over REST
+terms are loaded level by level (a term after every term it references),
+and the terms of one level are loaded concurrently. Every level is a
+barrier, and clustered or chained graphs have hundreds of levels, so
+--unordered loads everything in one pass when the service accepts
+references to terms it does not know yet.
+
+gRPC AddTerm has no relation field, so a gRPC-seeded glossary has no
+relations at all and GetTermRelations stays cheap whatever the topology.
+gRPC loads are therefore never ordered. Seed the REST service when heavy
+graph endpoints are measured.
+
+Usage:
+    python -m common.seeding --terms 20000 --topology power_law --protocol rest
+    python -m common.seeding --terms 5000 --topology clusters --output glossary.json --dry-run
+    python -m common.seeding --input glossary.json --protocol grpc --concurrency 32
+    python -m common.seeding --terms 20000 --topology chains --unordered
+"""
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, List
+
+from .config import Config
+from .data_generator import DataGenerator
+
+TOPOLOGIES = ("power_law", "clusters", "chains")
+CHAIN_RELATIONS = ("subclass_of", "part_of", "depends_on")
+
+
+def power_law_edges(rng: random.Random, size: int, degree: int):
+    """Preferential attachment: each term links to `degree` earlier terms chosen by degree"""
+    endpoints = []
+    for source in range(1, size):
+        targets = set()
+        for _ in range(min(degree, source)):
+            if endpoints and rng.random() < 0.9:
+                targets.add(rng.choice(endpoints))
+            else:
+                targets.add(rng.randrange(source))
+        for target in targets:
+            endpoints.extend((source, target))
+            yield source, target
+
+
+def cluster_edges(rng: random.Random, size: int, degree: int, clusters: int, bridge_ratio: float = 0.02):
+    """Random links inside contiguous clusters plus a few links to other clusters"""
+    cluster_size = max(1, size // clusters)
+    for source in range(1, size):
+        first = source - source % cluster_size
+        targets = set()
+        for _ in range(degree):
+            if source > first and rng.random() >= bridge_ratio:
+                targets.add(rng.randrange(first, source))
+            else:
+                targets.add(rng.randrange(source))
+        yield from ((source, target) for target in targets)
+
+
+def chain_edges(size: int, chain_length: int):
+    """Every term points to its predecessor in a chain of `chain_length` terms"""
+    for source in range(1, size):
+        if source % chain_length:
+            yield source, source - 1
+
+
+def generate_glossary(
+    size: int,
+    topology: str = "power_law",
+    seed: int = 42,
+    prefix: str = "Seed",
+    degree: int = 3,
+    clusters: int = 20,
+    chain_length: int = 25,
+) -> List[Dict]:
+    """Term payloads in load order, each with related_terms pointing to earlier terms"""
+    random.seed(seed)
+    rng = random.Random(seed)
+    terms = [DataGenerator.generate_term_payload(f"{prefix}_Term_{i:06d}", prefix=prefix) for i in range(size)]
+
+    if topology == "power_law":
+        edges = power_law_edges(rng, size, degree)
+    elif topology == "clusters":
+        edges = cluster_edges(rng, size, degree, clusters)
+    elif topology == "chains":
+        edges = chain_edges(size, chain_length)
+    else:
+        raise ValueError(f"Unknown topology {topology!r}, expected one of: {', '.join(TOPOLOGIES)}")
+
+    for source, target in edges:
+        if topology == "chains":
+            relation_type = CHAIN_RELATIONS[(source // chain_length) % len(CHAIN_RELATIONS)]
+        else:
+            relation_type = rng.choice(DataGenerator.RELATION_TYPES)
+        terms[source]["related_terms"].append({"term": terms[target]["id"], "relation_type": relation_type})
+    return terms
+
+
+def load_levels(terms: List[Dict]) -> List[List[Dict]]:
+    """Group terms so that every term comes after all terms it references"""
+    level_of = {}
+    levels = []
+    for term in terms:
+        level = 1 + max((level_of.get(r["term"], -1) for r in term["related_terms"]), default=-1)
+        level_of[term["id"]] = level
+        if level == len(levels):
+            levels.append([])
+        levels[level].append(term)
+    return levels
+
+
+def describe(terms: List[Dict]):
+    degrees = Counter()
+    for term in terms:
+        for relation in term["related_terms"]:
+            degrees[term["id"]] += 1
+            degrees[relation["term"]] += 1
+    relations = sum(len(term["related_terms"]) for term in terms)
+    values = sorted((degrees[term["id"]] for term in terms), reverse=True)
+    top = values[:max(1, len(values) // 100)]
+    print("=" * 50)
+    print("GLOSSARY")
+    print("=" * 50)
+    print(f"Terms:           {len(terms)}")
+    print(f"Relations:       {relations}")
+    print(f"Mean degree:     {2 * relations / max(len(terms), 1):.2f}")
+    print(f"Max degree:      {values[0] if values else 0}")
+    print(f"Top 1% degree:   {sum(top) / len(top) if top else 0:.1f}")
+    print(f"Load levels:     {len(load_levels(terms))}")
+    print("=" * 50)
+
+
+class RestLoader:
+    """POST /terms with the full payload including related_terms"""
+
+    ordered = True
+
+    def __init__(self, base_url: str, timeout: float = 30):
+        import requests
+        self.requests = requests
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def add(self, term: Dict) -> bool:
+        """Returns False when the term already exists"""
+        session = getattr(self.local, "session", None)
+        if session is None:
+            session = self.local.session = self.requests.Session()
+        response = session.post(f"{self.base_url}/terms", json=term, timeout=self.timeout)
+        if response.status_code in (400, 409) and "exist" in response.text.lower():
+            return False
+        response.raise_for_status()
+        return True
+
+
+class GrpcLoader:
+    """AddTerm per term; relations cannot be expressed in AddTermRequest and are dropped"""
+
+    ordered = False
+
+    def __init__(self, target: str, timeout: float = 30):
+        from .grpc_client import glossary_pb2, glossary_pb2_grpc, grpc
+        self.grpc = grpc
+        self.pb = glossary_pb2
+        self.pb_grpc = glossary_pb2_grpc
+        self.target = target
+        self.timeout = timeout
+        self.local = threading.local()
+
+    def add(self, term: Dict) -> bool:
+        stub = getattr(self.local, "stub", None)
+        if stub is None:
+            stub = self.local.stub = self.pb_grpc.GlossaryServiceStub(self.grpc.insecure_channel(self.target))
+        request = self.pb.AddTermRequest(
+            term=term["term"],
+            description=term["definition"],
+            sources=term["source"].split(", "),
+        )
+        try:
+            stub.AddTerm(request, timeout=self.timeout)
+        except self.grpc.RpcError as e:
+            if e.code() == self.grpc.StatusCode.ALREADY_EXISTS:
+                return False
+            raise
+        return True
+
+
+class Progress:
+    """Thread-safe counters with a once-per-interval progress line"""
+
+    def __init__(self, total: int, interval: float = 1.0):
+        self.total = total
+        self.interval = interval
+        self.added = 0
+        self.skipped = 0
+        self.failed = 0
+        self.errors = Counter()
+        self.start = time.perf_counter()
+        self.last_print = self.start
+        self.lock = threading.Lock()
+
+    @property
+    def done(self):
+        return self.added + self.skipped + self.failed
+
+    def update(self, added=0, skipped=0, failed=0, errors=()):
+        with self.lock:
+            self.added += added
+            self.skipped += skipped
+            self.failed += failed
+            self.errors.update(errors)
+            now = time.perf_counter()
+            if now - self.last_print >= self.interval:
+                self.last_print = now
+                self.print_line(now)
+
+    def print_line(self, now=None):
+        elapsed = (now or time.perf_counter()) - self.start
+        rate = self.done / elapsed if elapsed else 0
+        print(
+            f"  {self.done:>7}/{self.total} ({self.done / max(self.total, 1):>4.0%})  "
+            f"{rate:>8.1f} terms/s  added {self.added}  skipped {self.skipped}  failed {self.failed}",
+            flush=True,
+        )
+
+
+def load_batch(loader, batch: List[Dict], progress: Progress):
+    added = skipped = failed = 0
+    errors = []
+    for term in batch:
+        try:
+            if loader.add(term):
+                added += 1
+            else:
+                skipped += 1
+        except Exception as e:
+            failed += 1
+            errors.append(f"{type(e).__name__}: {e}"[:120])
+    progress.update(added, skipped, failed, errors)
+
+
+def load_glossary(loader, terms: List[Dict], concurrency: int = 16, batch_size: int = 50,
+                  ordered: bool = True) -> Progress:
+    """
+    Load terms level by level (or all at once unless ordered); each level is
+    split into batches run concurrently
+
+    Levels smaller than concurrency * batch_size get smaller batches so that
+    every worker thread stays busy.
+    """
+    progress = Progress(len(terms))
+    levels = load_levels(terms) if ordered else [terms]
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for level in levels:
+            size = max(1, min(batch_size, -(-len(level) // concurrency)))
+            futures = [
+                pool.submit(load_batch, loader, level[i:i + size], progress)
+                for i in range(0, len(level), size)
+            ]
+            for future in as_completed(futures):
+                future.result()
+    progress.print_line()
+    return progress
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate and load a large glossary")
+    parser.add_argument("--terms", type=int, default=10000, help="number of terms to generate")
+    parser.add_argument("--topology", choices=TOPOLOGIES, default="power_law")
+    parser.add_argument("--degree", type=int, default=3, help="relations per new term (power_law, clusters)")
+    parser.add_argument("--clusters", type=int, default=20)
+    parser.add_argument("--chain-length", type=int, default=25)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--prefix", default="Seed", help="term name prefix")
+    parser.add_argument("--input", help="load a glossary written by --output instead of generating one")
+    parser.add_argument("--output", help="write the generated glossary to this JSON file")
+    parser.add_argument("--dry-run", action="store_true", help="generate (and write) only, do not load")
+    parser.add_argument("--protocol", choices=("rest", "grpc"), default="rest")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--unordered", action="store_true",
+                        help="REST: load all terms in one pass instead of level by level")
+    args = parser.parse_args()
+    for option in ("terms", "degree", "clusters", "chain_length", "concurrency", "batch_size"):
+        if getattr(args, option) < 1:
+            parser.error(f"--{option.replace('_', '-')} must be at least 1")
+
+    if args.input:
+        with open(args.input) as f:
+            terms = json.load(f)
+    else:
+        terms = generate_glossary(
+            args.terms, args.topology, args.seed, args.prefix, args.degree, args.clusters, args.chain_length
+        )
+    describe(terms)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(terms, f)
+        print(f"Glossary written to {args.output}")
+    if args.dry_run:
+        return
+
+    if args.protocol == "rest":
+        loader = RestLoader(Config.REST_BASE_URL)
+        print(f"Loading into {Config.REST_BASE_URL} (REST)")
+    else:
+        loader = GrpcLoader(Config.GRPC_TARGET)
+        print(f"Loading into {Config.GRPC_TARGET} (gRPC, relations are not loaded)")
+
+    ordered = loader.ordered and not args.unordered
+    if ordered:
+        print(f"Loading in {len(load_levels(terms))} dependency levels")
+    progress = load_glossary(loader, terms, args.concurrency, args.batch_size, ordered)
+    elapsed = time.perf_counter() - progress.start
+    print("=" * 50)
+    print(f"Added:      {progress.added}")
+    print(f"Skipped:    {progress.skipped} (already present)")
+    print(f"Failed:     {progress.failed}")
+    print(f"Duration:   {elapsed:.1f}s")
+    print(f"Throughput: {progress.done / elapsed if elapsed else 0:.1f} terms/s")
+    print("=" * 50)
+    for error, count in progress.errors.most_common(5):
+        print(f"  {count:>6} x {error}")
+    if progress.failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Scenario-aware user sessions fitted from recorded traffic
+
+Fits a first-order Markov chain of endpoint transitions plus empirical
+think-time distributions from access logs or JSONL traces, and compiles it
+into flat lookup tables so replaying a step costs one bisect and one
+interpolated table read.
+
+Supported inputs (one request per line):
+- access logs with a timestamp, e.g. common/combined log format
+    127.0.0.1 - - [19/Oct/2026:08:00:01 +0000] "GET /terms HTTP/1.1" 200 512
+  or uvicorn/FastAPI lines prefixed by a logging timestamp
+    2026-10-19 08:00:01,250 INFO:     127.0.0.1:51234 - "GET /terms/FastAPI HTTP/1.1" 200 OK
+- JSONL traces: {"ts": 1760860801.25, "client": "u1", "endpoint": "GetTerm"}
+  ("ts" may be epoch seconds or ISO-8601; "session" overrides client-based
+  sessionization; "method" + "path" may replace "endpoint")
+
+Usage:
+    python -m common.session_model fit access.log -o session_model.json
+    python -m common.session_model show session_model.json
+    SESSION_MODEL=session_model.json locust -f locustfile_rest_simple.py ...
+"""
+import argparse
+import bisect
+import json
+import random
+import re
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Tuple
+
+START = "__start__"
+END = "__end__"
+
+THINK_QUANTILES = 100
+
+CLF_RE = re.compile(
+    r'^(?P<client>\S+) \S+ \S+ \[(?P<ts>[^\]]+)\] "(?P<method>[A-Z]+) (?P<path>\S+)[^"]*"'
+)
+LOGGING_RE = re.compile(
+    r'^(?P<ts>\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?).*?'
+    r'(?P<client>\d{1,3}(?:\.\d{1,3}){3}|\[[0-9a-fA-F:]+\])(?::\d+)? - "(?P<method>[A-Z]+) (?P<path>\S+)[^"]*"'
+)
+TERM_PATH_RE = re.compile(r'^/terms/[^/]+$')
+
+
+def normalize_endpoint(method: str, path: str) -> str:
+    """Collapse concrete URLs to endpoint keys, e.g. GET /terms/FastAPI -> GET /terms/{term}"""
+    path = path.split("?", 1)[0].rstrip("/") or "/"
+    if TERM_PATH_RE.match(path):
+        path = "/terms/{term}"
+    return f"{method} {path}"
+
+
+def parse_timestamp(value) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    for fmt in ("%d/%b/%Y:%H:%M:%S %z", "%Y-%m-%d %H:%M:%S,%f", "%Y-%m-%d %H:%M:%S.%f"):
+        try:
+            return datetime.strptime(value, fmt).timestamp()
+        except ValueError:
+            pass
+    return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+
+
+def parse_line(line: str) -> Optional[Tuple[str, float, str]]:
+    """Return (session key, timestamp, endpoint) or None for lines that are not requests"""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith("{"):
+        record = json.loads(line)
+        endpoint = record.get("endpoint") or normalize_endpoint(record["method"], record["path"])
+        session = str(record.get("session") or record.get("client", ""))
+        return session, parse_timestamp(record["ts"]), endpoint
+    match = CLF_RE.match(line) or LOGGING_RE.match(line)
+    if not match:
+        return None
+    return (
+        match.group("client"),
+        parse_timestamp(match.group("ts")),
+        normalize_endpoint(match.group("method"), match.group("path")),
+    )
+
+
+def quantile_table(samples: List[float], points: int = THINK_QUANTILES) -> List[float]:
+    """Empirical inverse CDF sampled at `points` + 1 evenly spaced probabilities"""
+    samples = sorted(samples)
+    last = len(samples) - 1
+    return [round(samples[round(last * i / points)], 4) for i in range(points + 1)]
+
+
+def fit(
+    lines: Iterable[str],
+    session_timeout: float = 300.0,
+    max_think_time: float = 60.0,
+) -> Dict:
+    """Fit transition probabilities and think-time quantiles; returns the serializable model"""
+    requests_by_session = defaultdict(list)
+    for line in lines:
+        parsed = parse_line(line)
+        if parsed:
+            session, ts, endpoint = parsed
+            requests_by_session[session].append((ts, endpoint))
+
+    transitions = defaultdict(lambda: defaultdict(int))
+    think_times = defaultdict(list)
+    sessions = 0
+
+    for requests in requests_by_session.values():
+        requests.sort()
+        previous_ts, previous = None, END
+        for ts, endpoint in requests:
+            gap = ts - previous_ts if previous_ts is not None else None
+            if gap is None or gap > session_timeout:
+                if previous != END:
+                    transitions[previous][END] += 1
+                if gap is not None:
+                    think_times[END].append(min(gap, max_think_time))
+                transitions[START][endpoint] += 1
+                sessions += 1
+            else:
+                transitions[previous][endpoint] += 1
+                think_times[previous].append(min(gap, max_think_time))
+            previous_ts, previous = ts, endpoint
+        if previous != END:
+            transitions[previous][END] += 1
+
+    if not transitions:
+        raise ValueError("No requests found in the input")
+
+    all_think = [t for samples in think_times.values() for t in samples] or [1.0]
+    return {
+        "version": 1,
+        "sessions": sessions,
+        "transitions": {
+            state: {
+                target: round(count / sum(targets.values()), 6)
+                for target, count in sorted(targets.items())
+            }
+            for state, targets in sorted(transitions.items())
+        },
+        "think_times": {state: quantile_table(samples) for state, samples in sorted(think_times.items())},
+        "default_think_time": quantile_table(all_think),
+    }
+
+
+class SessionModel:
+    """Compiled model: per-state cumulative transition tables and think-time quantiles"""
+
+    def __init__(self, data: Dict):
+        transitions = data["transitions"]
+        self.states = sorted(set(transitions) | {t for targets in transitions.values() for t in targets} | {START, END})
+        index = {state: i for i, state in enumerate(self.states)}
+        self.start = index[START]
+        self.end = index[END]
+
+        default_think = tuple(data.get("default_think_time") or (1.0, 1.0))
+        self.cumulative: List[Tuple[float, ...]] = []
+        self.targets: List[Tuple[int, ...]] = []
+        self.think: List[Tuple[float, ...]] = []
+        for state in self.states:
+            targets = transitions.get(state, {})
+            if state == END:
+                targets = {START: 1.0}
+            total, cumulative = 0.0, []
+            for probability in targets.values():
+                total += probability
+                cumulative.append(total)
+            self.cumulative.append(tuple(c / total for c in cumulative) if total else (1.0,))
+            self.targets.append(tuple(index[t] for t in targets) if targets else (self.end,))
+            self.think.append(tuple(data.get("think_times", {}).get(state) or default_think))
+
+    @classmethod
+    def load(cls, path: str) -> "SessionModel":
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def next_state(self, state: int, rand=random.random) -> int:
+        cumulative = self.cumulative[state]
+        return self.targets[state][min(bisect.bisect_right(cumulative, rand()), len(cumulative) - 1)]
+
+    def think_time(self, state: int, rand=random.random) -> float:
+        table = self.think[state]
+        position = rand() * (len(table) - 1)
+        low = int(position)
+        if low + 1 >= len(table):
+            return table[-1]
+        return table[low] + (table[low + 1] - table[low]) * (position - low)
+
+
+class SessionReplayer:
+    """
+    Walks a SessionModel for one simulated user
+
+    actions maps endpoint keys to bound task methods. States without an action
+    (e.g. endpoints the other protocol does not have) are passed through and
+    their think time is added to the wait before the next executed request.
+    """
+
+    MAX_HOPS = 1000
+
+    def __init__(self, model: SessionModel, actions: Dict[str, callable]):
+        self.model = model
+        self.actions = [actions.get(state) for state in model.states]
+        if not any(self.actions):
+            raise ValueError("Session model has no endpoint this user can execute")
+        self.state = model.start
+        self._advance()
+
+    def _advance(self) -> float:
+        """Move to the next executable state, returning the think time accumulated on the way"""
+        model = self.model
+        think = 0.0
+        for _ in range(self.MAX_HOPS):
+            if self.state != model.start:
+                think += model.think_time(self.state)
+            self.state = model.next_state(self.state)
+            if self.actions[self.state] is not None:
+                return think
+        raise RuntimeError(f"No executable endpoint reached in {self.MAX_HOPS} transitions")
+
+    def step(self):
+        """Run the action of the current state"""
+        self.actions[self.state]()
+
+    def think_time(self) -> float:
+        """wait_time replacement: think time after the executed state, then move on"""
+        return self._advance()
+
+
+@lru_cache(maxsize=None)
+def load_model(path: str) -> SessionModel:
+    """Load and compile a model once per process"""
+    return SessionModel.load(path)
+
+
+def replay_session_step(user):
+    """Task used instead of the weighted @task set while a session model is active"""
+    user.session_replayer.step()
+
+
+def attach_session_model(user, path: Optional[str]) -> bool:
+    """
+    Switch a user to model-driven replay when a model path is configured
+
+    The user class declares `session_actions` ({endpoint key: method name}).
+    Returns True when the model was attached.
+    """
+    if not path:
+        return False
+    actions = {
+        endpoint: getattr(user, method_name)
+        for endpoint, method_name in user.session_actions.items()
+    }
+    user.session_replayer = SessionReplayer(load_model(path), actions)
+    user.tasks = [replay_session_step]
+    user.wait_time = user.session_replayer.think_time
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Fit and inspect session models")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    fit_parser = subparsers.add_parser("fit", help="fit a model from access logs / JSONL traces")
+    fit_parser.add_argument("inputs", nargs="+")
+    fit_parser.add_argument("-o", "--output", default="session_model.json")
+    fit_parser.add_argument("--session-timeout", type=float, default=300.0,
+                            help="gap in seconds that starts a new session")
+    fit_parser.add_argument("--max-think-time", type=float, default=60.0,
+                            help="cap for individual think-time samples in seconds")
+
+    show_parser = subparsers.add_parser("show", help="print a fitted model")
+    show_parser.add_argument("model")
+
+    args = parser.parse_args()
+
+    if args.command == "fit":
+        def lines():
+            for path in args.inputs:
+                with open(path) as f:
+                    yield from f
+        model = fit(lines(), args.session_timeout, args.max_think_time)
+        with open(args.output, "w") as f:
+            json.dump(model, f, indent=2)
+        print(f"Fitted {model['sessions']} sessions, {len(model['transitions'])} states -> {args.output}")
+        return
+
+    with open(args.model) as f:
+        data = json.load(f)
+    print("=" * 70)
+    print(f"SESSION MODEL ({data.get('sessions', '?')} sessions)")
+    print("=" * 70)
+    for state, targets in data["transitions"].items():
+        think = data["think_times"].get(state)
+        median = f"{think[len(think) // 2]:.2f}s" if think else "-"
+        print(f"{state}  (median think {median})")
+        for target, probability in sorted(targets.items(), key=lambda t: -t[1]):
+            print(f"    -> {target:<40} {probability:>6.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,331 @@
+"""
+Latency SLO gates for scenario runs
+
+SLO_FILE points to a JSON file with objectives per Locust request name
+("Aggregated" for the total row):
+
+    {
+      "abort": {"gracePeriod": "60s", "checkInterval": "10s",
+                "breachFactor": 2.0, "consecutiveChecks": 3},
+      "objectives": {
+        "Aggregated":         {"max_error_rate": 0.01},
+        "GET /graph [HEAVY]": {"max_p95_ms": 800, "max_p99_ms": 1500, "min_rps": 5},
+        "GetTerm [stress]":   {"type": "grpc", "max_p99_ms": 100},
+        "get_term":           [{"type": "rest", "max_p99_ms": 500},
+                               {"type": "grpc", "max_p99_ms": 300}]
+      }
+    }
+
+"type" selects one request type. Without it, all rows with that name are
+combined, except "-attempt" rows. A list gives one objective per entry, e.g.
+separate limits per protocol for the same operation name.
+
+During the run the master (or local runner) checks the objectives after
+the grace period against the last ~10 seconds: Locust's current response
+time percentiles, current RPS and the failure share of the current RPS, so a
+regression that starts late in a long run is not diluted by the good minutes
+before it. When any objective stays missed by breachFactor
+for consecutiveChecks checks in a row, the run is aborted. At the end all
+objectives are evaluated on the cumulative final stats. The verdict is printed and
+written to SLO_VERDICT as JSON. A failed verdict sets the process exit code:
+
+    3 - SLO violated (EXIT_SLO_FAILED)
+    4 - run aborted early on a clear breach (EXIT_SLO_ABORTED)
+
+When all objectives are met the exit code is left to Locust, which exits
+with 1 on request failures and 2 on unhandled task or greenlet errors.
+Request failures therefore still fail a passing run; set
+--exit-code-on-error 0 to let the error budget (max_error_rate) decide.
+"""
+import json
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import gevent
+from locust.runners import WorkerRunner
+from locust.stats import CachedResponseTimes, StatsEntry
+
+from .call_policy import parse_duration
+from .config import Config
+
+logger = logging.getLogger(__name__)
+
+EXIT_SLO_FAILED = 3
+EXIT_SLO_ABORTED = 4
+
+AGGREGATED = "Aggregated"
+METRICS = ("max_p95_ms", "max_p99_ms", "min_rps", "max_error_rate")
+
+
+@dataclass(frozen=True)
+class Objective:
+    name: str
+    request_type: Optional[str] = None
+    max_p95_ms: Optional[float] = None
+    max_p99_ms: Optional[float] = None
+    min_rps: Optional[float] = None
+    max_error_rate: Optional[float] = None
+
+
+@dataclass(frozen=True)
+class AbortPolicy:
+    grace_period: float = 60.0
+    check_interval: float = 10.0
+    breach_factor: float = 2.0
+    consecutive_checks: int = 3
+
+
+class CheckResult:
+    """Outcome of one metric of one objective"""
+
+    __slots__ = ("name", "request_type", "metric", "limit", "actual", "passed")
+
+    def __init__(self, name, request_type, metric, limit, actual, passed):
+        self.name = name
+        self.request_type = request_type
+        self.metric = metric
+        self.limit = limit
+        self.actual = actual
+        self.passed = passed
+
+    def to_dict(self):
+        return {slot: getattr(self, slot) for slot in self.__slots__}
+
+
+class SloSet:
+    """Objectives plus the early-abort policy, evaluated against Locust stats"""
+
+    def __init__(self, objectives: List[Objective], abort: AbortPolicy = None):
+        self.objectives = objectives
+        self.abort = abort or AbortPolicy()
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "SloSet":
+        objectives = []
+        for name, entries in data.get("objectives", {}).items():
+            for limits in entries if isinstance(entries, list) else [entries]:
+                unknown = set(limits) - set(METRICS) - {"type"}
+                if unknown:
+                    raise ValueError(f"{name}: unknown SLO keys {', '.join(sorted(unknown))}")
+                if not any(metric in limits for metric in METRICS):
+                    raise ValueError(f"{name}: no objective, expected one of {', '.join(METRICS)}")
+                objectives.append(Objective(
+                    name=name,
+                    request_type=limits.get("type"),
+                    **{metric: float(limits[metric]) for metric in METRICS if metric in limits},
+                ))
+        if not objectives:
+            raise ValueError("SLO file defines no objectives")
+
+        abort = data.get("abort", {})
+        abort_policy = AbortPolicy(
+            grace_period=parse_duration(abort.get("gracePeriod", 60.0)),
+            check_interval=parse_duration(abort.get("checkInterval", 10.0)),
+            breach_factor=float(abort.get("breachFactor", 2.0)),
+            consecutive_checks=int(abort.get("consecutiveChecks", 3)),
+        )
+        if abort_policy.breach_factor < 1 or abort_policy.consecutive_checks < 1:
+            raise ValueError("breachFactor must be >= 1 and consecutiveChecks >= 1")
+        return cls(objectives, abort_policy)
+
+    @classmethod
+    def load(cls, path: str) -> "SloSet":
+        with open(path) as f:
+            return cls.from_dict(json.load(f))
+
+    @staticmethod
+    def entry_for(stats, objective: Objective) -> Optional[StatsEntry]:
+        if objective.name == AGGREGATED:
+            return stats.total
+        entries = [
+            entry for (name, request_type), entry in stats.entries.items()
+            if name == objective.name and not request_type.endswith("-attempt")
+            and objective.request_type in (None, request_type)
+        ]
+        if len(entries) <= 1:
+            return entries[0] if entries else None
+        combined = StatsEntry(stats, objective.name, "", use_response_times_cache=stats.use_response_times_cache)
+        for entry in entries:
+            combined.extend(entry)
+        if stats.use_response_times_cache:
+            # extend() does not merge the per-second history the current percentiles are read from
+            shared = set.intersection(*(set(entry.response_times_cache or ()) for entry in entries))
+            combined.response_times_cache = OrderedDict(
+                (second, CachedResponseTimes(
+                    response_times=merge_response_times(entry.response_times_cache[second].response_times
+                                                        for entry in entries),
+                    num_requests=sum(entry.response_times_cache[second].num_requests for entry in entries),
+                ))
+                for second in sorted(shared)
+            )
+        return combined
+
+    def evaluate(self, stats, live: bool = False, factor: float = 1.0) -> List[CheckResult]:
+        """
+        Check every objective; limits are relaxed by `factor` (early-abort checks)
+
+        Final checks use the cumulative stats, live checks the last ~10 seconds
+        (stats.use_response_times_cache must be set). Latency and error rate are
+        skipped while an endpoint has no (recent) requests, but min_rps then fails.
+        """
+        results = []
+        for objective in self.objectives:
+            entry = self.entry_for(stats, objective)
+            rps = (entry.current_rps if live else entry.total_rps) if entry else 0.0
+            requests = (rps if live else entry.num_requests) if entry else 0
+            for metric in METRICS:
+                limit = getattr(objective, metric)
+                if limit is None:
+                    continue
+                if metric == "min_rps":
+                    actual = rps
+                    passed = actual >= limit / factor
+                elif not requests:
+                    continue
+                elif metric == "max_error_rate":
+                    actual = entry.current_fail_per_sec / rps if live else entry.fail_ratio
+                    passed = actual <= limit * factor
+                else:
+                    percentile = 0.95 if metric == "max_p95_ms" else 0.99
+                    if live:
+                        actual = entry.get_current_response_time_percentile(percentile)
+                        if actual is None:
+                            continue
+                    else:
+                        actual = entry.get_response_time_percentile(percentile)
+                    passed = actual <= limit * factor
+                results.append(CheckResult(
+                    objective.name, objective.request_type, metric, limit, round(actual, 4), passed
+                ))
+        return results
+
+
+def merge_response_times(dicts) -> Dict[int, int]:
+    merged: Dict[int, int] = {}
+    for response_times in dicts:
+        for response_time, count in response_times.items():
+            merged[response_time] = merged.get(response_time, 0) + count
+    return merged
+
+
+class SloMonitor:
+    """Live early-abort checks and the final verdict for one run"""
+
+    def __init__(self, slos: SloSet, environment, slo_file: str, verdict_path: str = ""):
+        self.slos = slos
+        self.environment = environment
+        self.slo_file = slo_file
+        self.verdict_path = verdict_path
+        self.greenlet = None
+        self.started = None
+        self.abort_reason: Optional[str] = None
+
+    def start(self):
+        self.started = time.time()
+        self.abort_reason = None
+        self.greenlet = gevent.spawn(self._watch)
+
+    def stop(self):
+        if self.greenlet is not None:
+            self.greenlet.kill(block=False)
+            self.greenlet = None
+
+    def _watch(self):
+        policy = self.slos.abort
+        gevent.sleep(policy.grace_period)
+        streaks: Dict[Tuple[str, Optional[str], str], int] = {}
+        while True:
+            for result in self.slos.evaluate(self.environment.stats, live=True, factor=policy.breach_factor):
+                key = (result.name, result.request_type, result.metric)
+                streaks[key] = 0 if result.passed else streaks.get(key, 0) + 1
+                if streaks[key] >= policy.consecutive_checks:
+                    label = result.name + (f" ({result.request_type})" if result.request_type else "")
+                    self.abort_reason = (
+                        f"{label}: {result.metric} {result.actual} vs limit {result.limit} "
+                        f"(breach factor {policy.breach_factor}, {streaks[key]} consecutive checks)"
+                    )
+                    logger.error(f"SLO clearly breached, aborting run - {self.abort_reason}")
+                    self.greenlet = None
+                    self.environment.runner.quit()
+                    return
+            gevent.sleep(policy.check_interval)
+
+    def verdict(self) -> Dict:
+        results = self.slos.evaluate(self.environment.stats)
+        if self.abort_reason:
+            verdict, exit_code = "aborted", EXIT_SLO_ABORTED
+        elif all(result.passed for result in results):
+            verdict, exit_code = "pass", 0
+        else:
+            verdict, exit_code = "fail", EXIT_SLO_FAILED
+        stats = self.environment.stats
+        return {
+            "verdict": verdict,
+            "exit_code": exit_code,
+            "slo_file": self.slo_file,
+            "duration_s": round(time.time() - self.started, 1) if self.started else 0.0,
+            "abort_reason": self.abort_reason,
+            "no_requests": [
+                objective.name for objective in self.slos.objectives
+                if not getattr(self.slos.entry_for(stats, objective), "num_requests", 0)
+            ],
+            "checks": [result.to_dict() for result in results],
+        }
+
+    def finish(self):
+        """Print and write the verdict; a failed verdict sets the process exit code"""
+        self.stop()
+        verdict = self.verdict()
+        print_verdict(verdict)
+        if self.verdict_path:
+            with open(self.verdict_path, "w") as f:
+                json.dump(verdict, f, indent=2)
+            print(f"SLO verdict written to {self.verdict_path}")
+        if verdict["exit_code"]:
+            self.environment.process_exit_code = max(self.environment.process_exit_code or 0, verdict["exit_code"])
+
+
+def print_verdict(verdict: Dict):
+    print("=" * 100)
+    exit_code = f" (exit code {verdict['exit_code']})" if verdict["exit_code"] else ""
+    print(f"SLO VERDICT: {verdict['verdict'].upper()}{exit_code}")
+    print("=" * 100)
+    print(f"{'Endpoint':<45} {'Metric':<16} {'Limit':>10} {'Actual':>10}  Result")
+    print("-" * 100)
+    for check in verdict["checks"]:
+        name = check["name"] + (f" ({check['request_type']})" if check["request_type"] else "")
+        print(
+            f"{name:<45} {check['metric']:<16} {check['limit']:>10g} {check['actual']:>10g}  "
+            f"{'ok' if check['passed'] else 'VIOLATED'}"
+        )
+    if verdict["no_requests"]:
+        print(f"No requests (latency objectives not checked): {', '.join(verdict['no_requests'])}")
+    if verdict["abort_reason"]:
+        print(f"Aborted: {verdict['abort_reason']}")
+    print("=" * 100)
+
+
+_registered = False
+
+
+def register_slo_gates(events):
+    """Hook SLO checks into Locust events when SLO_FILE is set (safe to call from several locustfiles)"""
+    global _registered
+    if _registered:
+        return
+    _registered = True
+    events.init.add_listener(_on_init)
+
+
+def _on_init(environment, **kwargs):
+    if isinstance(environment.runner, WorkerRunner) or not Config.SLO_FILE:
+        return
+    monitor = SloMonitor(SloSet.load(Config.SLO_FILE), environment, Config.SLO_FILE, Config.SLO_VERDICT)
+    # live checks read the current (windowed) percentiles
+    environment.stats.use_response_times_cache = True
+    environment.events.test_start.add_listener(lambda **kw: monitor.start())
+    environment.events.test_stop.add_listener(lambda **kw: monitor.stop())
+    environment.events.quitting.add_listener(lambda **kw: monitor.finish())
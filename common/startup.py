@@ -0,0 +1,174 @@
+"""
+Fast, fail-early startup for distributed runs
+
+- protocol modules (grpc, generated glossary stubs) are imported lazily on first use
+- configuration is parsed and validated once on the master (or local runner),
+  which exits with a clear message before any user is spawned
+- every worker asks the master for the frozen config snapshot from its init
+  event (a snapshot pushed on connect can arrive before the handler exists);
+  `config_installed` fires once the configuration is final on this node
+  (master/local: after validation, worker: when the snapshot arrives)
+- every worker reports its startup time (process start -> init event) and
+  the master prints a summary when the test starts
+"""
+import importlib
+import importlib.util
+import logging
+import statistics
+import sys
+import time
+from typing import Collection, List, Optional, Tuple
+
+import psutil
+from locust.event import EventHook
+from locust.runners import MasterRunner, WorkerRunner
+
+from .config import Config, ConfigError, ConfigSnapshot
+
+logger = logging.getLogger(__name__)
+
+
+class ProtocolModuleError(ImportError):
+    """A lazily imported protocol module is not available"""
+
+
+class LazyModule:
+    """Module proxy importing the real module on first attribute access"""
+
+    def __init__(self, name: str, hint: str = None):
+        self._name = name
+        self._hint = hint
+        self._module = None
+        self.load_time = None
+
+    def available(self) -> bool:
+        """Whether the module can be imported, without importing it"""
+        if self._module is not None:
+            return True
+        try:
+            return importlib.util.find_spec(self._name) is not None
+        except (ImportError, ValueError):
+            return False
+
+    def load(self):
+        if self._module is None:
+            start = time.perf_counter()
+            try:
+                self._module = importlib.import_module(self._name)
+            except ImportError as e:
+                message = f"Required module {self._name!r} could not be imported: {e}"
+                if self._hint:
+                    message += f" ({self._hint})"
+                raise ProtocolModuleError(message) from e
+            self.load_time = time.perf_counter() - start
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self.load(), attr)
+
+    def __repr__(self):
+        state = "loaded" if self._module is not None else "not loaded"
+        return f"<LazyModule {self._name!r} ({state})>"
+
+
+def lazy_import(name: str, hint: str = None) -> LazyModule:
+    return LazyModule(name, hint)
+
+
+config_installed = EventHook()
+
+_required_modules: List[Tuple[LazyModule, Optional[Collection[str]]]] = []
+_worker_startup = {}
+_registered = False
+
+
+def process_uptime() -> float:
+    """Seconds since this process was started"""
+    return time.time() - psutil.Process().create_time()
+
+
+def register_startup_hooks(events, required_modules=(), user_classes: Collection[str] = None):
+    """
+    Hook startup validation and config distribution into Locust events
+
+    Safe to call from several locustfiles; listeners are registered once and
+    the required modules of all callers are checked. With user_classes (class
+    names) the modules are only required when one of those classes is selected
+    for the run.
+    """
+    global _registered
+    _required_modules.extend((module, user_classes) for module in required_modules)
+    if _registered:
+        return
+    _registered = True
+    events.init.add_listener(_on_init)
+    events.test_start.add_listener(_on_test_start)
+
+
+def _on_init(environment, **kwargs):
+    runner = environment.runner
+    startup = process_uptime()
+
+    if isinstance(runner, WorkerRunner):
+        runner.register_message("config_snapshot", _on_config_snapshot)
+        runner.send_message("config_request")
+        runner.send_message("worker_startup", {"startup_s": startup})
+        return
+
+    try:
+        snapshot = ConfigSnapshot.from_env().validate()
+    except ConfigError as e:
+        _fail(f"Invalid configuration: {e}")
+    selected = {user_class.__name__ for user_class in environment.user_classes}
+    missing = [
+        module for module, user_classes in _required_modules
+        if (user_classes is None or selected & set(user_classes)) and not module.available()
+    ]
+    if missing:
+        _fail("\n".join(
+            f"Module {module._name!r} not found" + (f" ({module._hint})" if module._hint else "")
+            for module in missing
+        ))
+    Config.install(snapshot)
+    config_installed.fire(environment=environment)
+
+    if isinstance(runner, MasterRunner):
+        _worker_startup.clear()
+        runner.register_message("worker_startup", _on_worker_startup)
+
+        def send_config_snapshot(environment, msg, **kwargs):
+            runner.send_message("config_snapshot", snapshot.to_dict(), client_id=msg.node_id)
+
+        runner.register_message("config_request", send_config_snapshot)
+    else:
+        logger.info(f"Startup time: {startup:.2f}s")
+
+
+def _fail(message):
+    print("=" * 70)
+    print(f"ERROR: {message}")
+    print("=" * 70)
+    sys.exit(1)
+
+
+def _on_config_snapshot(environment, msg, **kwargs):
+    Config.install(ConfigSnapshot.from_dict(msg.data))
+    config_installed.fire(environment=environment)
+
+
+def _on_worker_startup(environment, msg, **kwargs):
+    _worker_startup[msg.node_id] = msg.data["startup_s"]
+
+
+def _on_test_start(environment, **kwargs):
+    if not isinstance(environment.runner, MasterRunner) or not _worker_startup:
+        return
+    times = sorted(_worker_startup.values())
+    print("=" * 50)
+    print("WORKER STARTUP")
+    print("=" * 50)
+    print(f"Workers:   {len(times)}")
+    print(f"Min:       {times[0]:.2f}s")
+    print(f"Median:    {statistics.median(times):.2f}s")
+    print(f"Max:       {times[-1]:.2f}s")
+    print("=" * 50)
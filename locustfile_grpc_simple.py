@@ -14,33 +14,28 @@ Usage:
 """
 
 from locust import User, task, between, events
-import grpc
+from locust.runners import WorkerRunner
 import time
 import random
 import os
-import sys
 
-try:
-    import glossary_pb2
-    import glossary_pb2_grpc
-except ImportError:
-    print("=" * 70)
-    print("ERROR: gRPC generated files not found!")
-    print("=" * 70)
-    sys.exit(1)
+from common import Config
+from common.call_policy import print_attempt_amplification
+from common.grpc_client import GrpcClient, PROTOCOL_MODULES, glossary_pb2, grpc
+from common.metrics_exporter import register_metrics_exporter
+from common.session_model import attach_session_model
+from common.slo import register_slo_gates
+from common.startup import register_startup_hooks
 
+register_startup_hooks(events, required_modules=PROTOCOL_MODULES)
+register_metrics_exporter(events)
+register_slo_gates(events)
 
-class GrpcClient:
-    """gRPC client wrapper for Locust"""
-    
-    def __init__(self, host):
-        self.host = host
-        self.channel = grpc.insecure_channel(host)
-        self.stub = glossary_pb2_grpc.GlossaryServiceStub(self.channel)
-    
-    def __del__(self):
-        if hasattr(self, 'channel'):
-            self.channel.close()
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    if not isinstance(environment.runner, WorkerRunner):
+        print_attempt_amplification(environment.stats)
 
 
 class GrpcUser(User):
@@ -60,7 +55,7 @@ class GrpcUser(User):
         """Initialize user session data"""
         try:
             request = glossary_pb2.ListTermsRequest()
-            response = self.client.stub.ListTerms(request)
+            response = self.client.call("ListTerms", request, name="ListTerms [init]")
             self.existing_terms = [term.term for term in response.terms]
         except Exception as e:
             print(f"Failed to get initial terms: {e}")
@@ -68,8 +63,21 @@ class GrpcUser(User):
 
 class RESTLikeGrpcUser(GrpcUser):
     """
-    User simulating REST-like behavior patterns
+    User simulating REST-like behavior patterns,
+    or replay of a fitted session model when SESSION_MODEL is set
     """
+    session_actions = {
+        "ListTerms": "list_all_terms",
+        "SearchTerms": "search_terms",
+        "GetTerm": "get_specific_term",
+        "GetTermRelations": "get_term_relations",
+        "GET /terms": "list_all_terms",
+        "GET /terms/{term}": "get_specific_term",
+    }
+    
+    def on_start(self):
+        super().on_start()
+        attach_session_model(self, Config.SESSION_MODEL)
     
     @task(35)
     def list_all_terms(self):
@@ -77,7 +85,7 @@ class RESTLikeGrpcUser(GrpcUser):
         start_time = time.time()
         try:
             request = glossary_pb2.ListTermsRequest()
-            response = self.client.stub.ListTerms(request, timeout=10)
+            response = self.client.call("ListTerms", request, name="ListTerms", timeout=10)
             
             self.existing_terms = [term.term for term in response.terms]
             
@@ -111,7 +119,7 @@ class RESTLikeGrpcUser(GrpcUser):
             query = random.choice(queries)
             
             request = glossary_pb2.SearchTermsRequest(query=query, limit=10)
-            response = self.client.stub.SearchTerms(request, timeout=10)
+            response = self.client.call("SearchTerms", request, name="SearchTerms", timeout=10)
             
             total_time = int((time.time() - start_time) * 1000)
             events.request.fire(
@@ -145,7 +153,9 @@ class RESTLikeGrpcUser(GrpcUser):
                 term_id = random.choice(self.existing_terms)
             
             request = glossary_pb2.GetTermRequest(term_id=term_id)
-            response = self.client.stub.GetTerm(request, timeout=10)
+            response = self.client.call(
+                "GetTerm", request, name="GetTerm", timeout=10, success_statuses=("NOT_FOUND",)
+            )
             
             total_time = int((time.time() - start_time) * 1000)
             events.request.fire(
@@ -199,7 +209,9 @@ class RESTLikeGrpcUser(GrpcUser):
                 term_id = random.choice(self.existing_terms)
             
             request = glossary_pb2.GetTermRelationsRequest(term_id=term_id)
-            response = self.client.stub.GetTermRelations(request, timeout=10)
+            response = self.client.call(
+                "GetTermRelations", request, name="GetTermRelations", timeout=10, success_statuses=("NOT_FOUND",)
+            )
             
             total_time = int((time.time() - start_time) * 1000)
             events.request.fire(
@@ -263,7 +275,7 @@ class LightGrpcUser(GrpcUser):
         start_time = time.time()
         try:
             request = glossary_pb2.ListTermsRequest()
-            response = self.client.stub.ListTerms(request, timeout=10)
+            response = self.client.call("ListTerms", request, name="ListTerms [light]", timeout=10)
             self.existing_terms = [term.term for term in response.terms]
             
             total_time = int((time.time() - start_time) * 1000)
@@ -297,7 +309,7 @@ class LightGrpcUser(GrpcUser):
                 term_id = 'grpc'
             
             request = glossary_pb2.GetTermRequest(term_id=term_id)
-            response = self.client.stub.GetTerm(request, timeout=10)
+            response = self.client.call("GetTerm", request, name="GetTerm [light]", timeout=10)
             
             total_time = int((time.time() - start_time) * 1000)
             events.request.fire(
@@ -335,7 +347,7 @@ class HeavyGrpcUser(GrpcUser):
             query = random.choice(queries)
             
             request = glossary_pb2.SearchTermsRequest(query=query, limit=20)
-            response = self.client.stub.SearchTerms(request, timeout=10)
+            response = self.client.call("SearchTerms", request, name="SearchTerms [heavy]", timeout=10)
             
             total_time = int((time.time() - start_time) * 1000)
             events.request.fire(
@@ -363,7 +375,7 @@ class HeavyGrpcUser(GrpcUser):
         start_time = time.time()
         try:
             request = glossary_pb2.ListTermsRequest()
-            response = self.client.stub.ListTerms(request, timeout=10)
+            response = self.client.call("ListTerms", request, name="ListTerms [heavy]", timeout=10)
             
             total_time = int((time.time() - start_time) * 1000)
             events.request.fire(
@@ -394,11 +406,11 @@ class HeavyGrpcUser(GrpcUser):
             term_id = random.choice(['grpc', 'protobuf', 'http2', 'rpc'])
             
             request = glossary_pb2.GetTermRequest(term_id=term_id)
-            self.client.stub.GetTerm(request, timeout=10)
+            self.client.call("GetTerm", request, name="GetTerm [heavy]", timeout=10)
             
            
             rel_request = glossary_pb2.GetTermRelationsRequest(term_id=term_id)
-            response = self.client.stub.GetTermRelations(rel_request, timeout=10)
+            response = self.client.call("GetTermRelations", rel_request, name="GetTermRelations [heavy]", timeout=10)
             
             total_time = int((time.time() - start_time) * 1000)
             events.request.fire(
@@ -433,7 +445,7 @@ class StressGrpcUser(GrpcUser):
         start_time = time.time()
         try:
             request = glossary_pb2.ListTermsRequest()
-            response = self.client.stub.ListTerms(request, timeout=5)
+            response = self.client.call("ListTerms", request, name="ListTerms [stress]", timeout=5)
             
             total_time = int((time.time() - start_time) * 1000)
             events.request.fire(
@@ -462,7 +474,7 @@ class StressGrpcUser(GrpcUser):
         try:
             query = random.choice(["gRPC", "API", "HTTP"])
             request = glossary_pb2.SearchTermsRequest(query=query, limit=10)
-            response = self.client.stub.SearchTerms(request, timeout=5)
+            response = self.client.call("SearchTerms", request, name="SearchTerms [stress]", timeout=5)
             
             total_time = int((time.time() - start_time) * 1000)
             events.request.fire(
@@ -491,7 +503,7 @@ class StressGrpcUser(GrpcUser):
         try:
             term_id = random.choice(['grpc', 'protobuf', 'http2', 'rpc', 'api', 'rest'])
             request = glossary_pb2.GetTermRequest(term_id=term_id)
-            response = self.client.stub.GetTerm(request, timeout=5)
+            response = self.client.call("GetTerm", request, name="GetTerm [stress]", timeout=5)
             
             total_time = int((time.time() - start_time) * 1000)
             events.request.fire(
@@ -12,17 +12,60 @@ Usage:
         --users 50 --spawn-rate 5 --run-time 3m --headless
 """
 
-from locust import HttpUser, task, between
+from locust import HttpUser, task, between, events
+from locust.runners import WorkerRunner
 import random
 import os
 
+from common import Config
+from common.call_policy import PolicyHttpSession, load_policies, print_attempt_amplification
+from common.metrics_exporter import register_metrics_exporter
+from common.session_model import attach_session_model
+from common.slo import register_slo_gates
+from common.startup import register_startup_hooks
 
-class RESTUser(HttpUser):
+register_startup_hooks(events)
+register_metrics_exporter(events)
+register_slo_gates(events)
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    if not isinstance(environment.runner, WorkerRunner):
+        print_attempt_amplification(environment.stats)
+
+
+class PolicyHttpUser(HttpUser):
+    """
+    HttpUser whose client applies the configured call policies
+    (deadline, retry, hedging) to requests by their Locust name
+    """
+    abstract = True
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.client = PolicyHttpSession(
+            base_url=self.host,
+            request_event=self.environment.events.request,
+            user=self,
+            pool_manager=self.pool_manager,
+            policies=load_policies(Config.CALL_POLICY_FILE),
+        )
+        self.client.trust_env = False
+
+
+class RESTUser(PolicyHttpUser):
     """
     Read-only user for REST API testing
-    Realistic browsing behavior with different endpoint weights
+    Realistic browsing behavior with different endpoint weights,
+    or replay of a fitted session model when SESSION_MODEL is set
     """
     wait_time = between(1, 3)
+    session_actions = {
+        "GET /terms": "view_all_terms",
+        "GET /terms/{term}": "view_specific_term",
+        "GET /graph": "view_graph",
+    }
     
     def on_start(self):
         """Initialize user session data"""
@@ -35,6 +78,7 @@ class RESTUser(HttpUser):
                     self.existing_terms = [term.get('term', term.get('id')) for term in data if term.get('term') or term.get('id')]
             except:
                 pass
+        attach_session_model(self, Config.SESSION_MODEL)
     
     @task(35)
     def view_all_terms(self):
@@ -78,7 +122,8 @@ class RESTUser(HttpUser):
         with self.client.get(
             f"/terms/{term_id}",
             catch_response=True,
-            name="GET /terms/{term} [LIGHT]"
+            name="GET /terms/{term} [LIGHT]",
+            success_statuses=(404,),
         ) as response:
             if response.status_code == 200:
                 response.success()
@@ -103,7 +148,7 @@ class RESTUser(HttpUser):
         self.client.get("/graph", name="GET /graph [pattern]")
 
 
-class LightUser(HttpUser):
+class LightUser(PolicyHttpUser):
     """
     Light user - only views terms list and specific terms
     No heavy graph operations
@@ -135,7 +180,7 @@ class LightUser(HttpUser):
             self.client.get(f"/terms/{term_id}", name="GET /terms/{term} [light]")
 
 
-class HeavyUser(HttpUser):
+class HeavyUser(PolicyHttpUser):
     """
     Heavy user - frequently requests the graph
     Tests system under computationally intensive workload
@@ -159,7 +204,7 @@ class HeavyUser(HttpUser):
         self.client.get("/graph", name="GET /graph [heavy-pattern]")
 
 
-class StressUser(HttpUser):
+class StressUser(PolicyHttpUser):
     """
     Stress testing user with minimal wait time
     Used for stress tests to find breaking points
@@ -0,0 +1,108 @@
+"""
+Identical workload over REST and gRPC (Read-only by default)
+
+Both user classes replay the same precomputed operation sequence through the
+protocol-agnostic glossary client, so per-operation results are directly
+comparable. The i-th user of each class starts at the same offset of the
+sequence, picks the same term slots and runs the same mix.
+
+Operations: list_terms, get_term, search_terms, term_relations, graph, add_term
+
+Hosts are taken from REST_BASE_URL and GRPC_TARGET (--host is ignored).
+WORKLOAD_MIX overrides the weights, e.g. "list_terms=50,get_term=50";
+WORKLOAD_SEED changes the sequence.
+
+Usage:
+    locust -f locustfile_unified.py --users 100 --spawn-rate 10 --run-time 3m --headless
+    locust -f locustfile_unified.py RESTGlossaryUser ...   # one protocol only
+"""
+
+import itertools
+from functools import lru_cache
+
+from locust import User, task, between, events
+from locust.runners import WorkerRunner
+
+from common import Config
+from common.call_policy import load_policies, print_attempt_amplification
+from common.glossary_client import (
+    GrpcGlossaryClient,
+    RestGlossaryClient,
+    build_operation_sequence,
+    parse_mix,
+    print_protocol_comparison,
+)
+from common.grpc_client import GrpcClient, PROTOCOL_MODULES
+from common.metrics_exporter import register_metrics_exporter
+from common.slo import register_slo_gates
+from common.startup import register_startup_hooks
+
+SEQUENCE_LENGTH = 10000
+USER_OFFSET_STRIDE = 97
+
+register_startup_hooks(events, required_modules=PROTOCOL_MODULES, user_classes=["GrpcGlossaryUser"])
+register_metrics_exporter(events)
+register_slo_gates(events)
+
+
+@events.quitting.add_listener
+def on_quitting(environment, **kwargs):
+    if not isinstance(environment.runner, WorkerRunner):
+        print_protocol_comparison(environment.stats)
+        print_attempt_amplification(environment.stats)
+
+
+@lru_cache(maxsize=None)
+def operation_sequence(seed, mix):
+    return build_operation_sequence(seed, SEQUENCE_LENGTH, parse_mix(mix))
+
+
+class GlossaryUser(User):
+    """
+    Replays the shared operation sequence through a GlossaryClient
+    Subclasses only choose the transport by defining create_client()
+    """
+    abstract = True
+    wait_time = between(1, 3)
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.user_counter = itertools.count()
+
+    def on_start(self):
+        self.glossary = self.create_client()
+        self.sequence = operation_sequence(Config.WORKLOAD_SEED, Config.WORKLOAD_MIX)
+        self.position = next(self.user_counter) * USER_OFFSET_STRIDE % len(self.sequence)
+        try:
+            self.glossary.refresh_terms()
+        except Exception as e:
+            print(f"Failed to get initial terms: {e}")
+
+    @task
+    def next_operation(self):
+        operation, argument = self.sequence[self.position]
+        self.position = (self.position + 1) % len(self.sequence)
+        self.glossary.execute(operation, argument)
+
+
+class RESTGlossaryUser(GlossaryUser):
+    """Shared workload over REST"""
+
+    def create_client(self):
+        return RestGlossaryClient(
+            Config.REST_BASE_URL,
+            self.environment.events.request,
+            policies=load_policies(Config.CALL_POLICY_FILE),
+            term_prefix=Config.TERM_PREFIX,
+        )
+
+
+class GrpcGlossaryUser(GlossaryUser):
+    """Shared workload over gRPC"""
+
+    def create_client(self):
+        return GrpcGlossaryClient(
+            GrpcClient(Config.GRPC_TARGET),
+            self.environment.events.request,
+            term_prefix=Config.TERM_PREFIX,
+        )
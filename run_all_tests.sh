@@ -6,6 +6,7 @@ echo "================================"
 echo ""
 
 GREEN='\033[0;32m'
+RED='\033[0;31m'
 BLUE='\033[0;34m'
 YELLOW='\033[1;33m'
 NC='\033[0m' 
@@ -16,17 +17,26 @@ mkdir -p "$RESULTS_DIR"
 echo -e "${BLUE}Results will be saved to: $RESULTS_DIR${NC}"
 echo ""
 
+FAILED_TESTS=()
+
+# Exit codes: 1 - request failures, 2 - unhandled errors, 3 - SLO violated, 4 - aborted on SLO breach
 run_test() {
     local test_name=$1
     local script=$2
+    local code=0
     
     echo -e "${YELLOW}========================================${NC}"
     echo -e "${YELLOW}Running: $test_name${NC}"
     echo -e "${YELLOW}========================================${NC}"
     
-    bash "$script" "$RESULTS_DIR"
+    bash "$script" "$RESULTS_DIR" || code=$?
     
-    echo -e "${GREEN}✓ Completed: $test_name${NC}"
+    if [ $code -eq 0 ]; then
+        echo -e "${GREEN}✓ Completed: $test_name${NC}"
+    else
+        echo -e "${RED}✗ Failed: $test_name (exit code $code)${NC}"
+        FAILED_TESTS+=("$test_name (exit code $code)")
+    fi
     echo ""
     sleep 3
 }
@@ -43,16 +53,31 @@ run_test "5. Stress Test - REST API" "./scenarios/05_stress_rest.sh"
 run_test "6. Stress Test - gRPC" "./scenarios/06_stress_grpc.sh"
 run_test "7. Stability Test - REST API" "./scenarios/07_stability_rest.sh"
 run_test "8. Stability Test - gRPC" "./scenarios/08_stability_grpc.sh"
+run_test "9. Identical Workload - REST vs gRPC" "./scenarios/09_unified_compare.sh"
 
-echo -e "${GREEN}================================${NC}"
-echo -e "${GREEN}All tests completed!${NC}"
-echo -e "${GREEN}================================${NC}"
+if [ ${#FAILED_TESTS[@]} -eq 0 ]; then
+    echo -e "${GREEN}================================${NC}"
+    echo -e "${GREEN}All tests completed!${NC}"
+    echo -e "${GREEN}================================${NC}"
+else
+    echo -e "${RED}================================${NC}"
+    echo -e "${RED}${#FAILED_TESTS[@]} test(s) failed:${NC}"
+    for failed in "${FAILED_TESTS[@]}"; do
+        echo -e "${RED}  - $failed${NC}"
+    done
+    echo -e "${RED}================================${NC}"
+fi
 echo ""
 echo "Results saved in: $RESULTS_DIR"
 echo ""
 echo "Summary of tests:"
 ls -lh "$RESULTS_DIR"/*.html 2>/dev/null || echo "No HTML reports found"
 echo ""
+echo "SLO verdicts:"
+ls "$RESULTS_DIR"/*_slo.json 2>/dev/null || echo "No SLO verdicts found"
+echo ""
 echo "Total test duration: ~30 minutes"
 
-
+if [ ${#FAILED_TESTS[@]} -ne 0 ]; then
+    exit 1
+fi
@@ -2,6 +2,7 @@ set -e
 
 RESULTS_DIR=${1:-"results/test"}
 TEST_NAME="04_normal_grpc"
+SLO_FILE=${SLO_FILE-"slo/grpc.json"}
 GRPC_HOST=${GRPC_TARGET:-"localhost:50051"}
 
 echo "========================================="
@@ -11,6 +12,7 @@ echo "Host: $GRPC_HOST"
 echo "Users: 50, Spawn rate: 5/s, Duration: 10min"
 echo ""
 
+SLO_FILE=$SLO_FILE SLO_VERDICT="$RESULTS_DIR/${TEST_NAME}_slo.json" \
 locust -f locustfile_grpc_simple.py \
     --host=$GRPC_HOST \
     --users 50 \
@@ -24,6 +26,7 @@ echo ""
 echo "✓ Test complete! Results saved to:"
 echo "  - $RESULTS_DIR/${TEST_NAME}.html"
 echo "  - $RESULTS_DIR/${TEST_NAME}_stats.csv"
+echo "  - $RESULTS_DIR/${TEST_NAME}_slo.json"
 
 
 
@@ -0,0 +1,33 @@
+set -e
+
+RESULTS_DIR=${1:-"results/test"}
+TEST_NAME="09_unified_compare"
+SLO_FILE=${SLO_FILE-"slo/unified.json"}
+REST_HOST=${REST_BASE_URL:-"http://localhost:8000"}
+GRPC_HOST=${GRPC_TARGET:-"localhost:50051"}
+
+echo "========================================="
+echo "Identical Workload - REST vs gRPC"
+echo "========================================="
+echo "REST host: $REST_HOST"
+echo "gRPC host: $GRPC_HOST"
+echo "Users: 100 (50 per protocol), Spawn rate: 10/s, Duration: 3min"
+echo ""
+
+SLO_FILE=$SLO_FILE SLO_VERDICT="$RESULTS_DIR/${TEST_NAME}_slo.json" REST_BASE_URL=$REST_HOST GRPC_TARGET=$GRPC_HOST \
+locust -f locustfile_unified.py \
+    --users 100 \
+    --spawn-rate 10 \
+    --run-time 3m \
+    --headless \
+    --html "$RESULTS_DIR/${TEST_NAME}.html" \
+    --csv "$RESULTS_DIR/${TEST_NAME}"
+
+echo ""
+echo "✓ Test complete! Results saved to:"
+echo "  - $RESULTS_DIR/${TEST_NAME}.html"
+echo "  - $RESULTS_DIR/${TEST_NAME}_stats.csv"
+echo "  - $RESULTS_DIR/${TEST_NAME}_slo.json"
+
+
+